@@ -17,6 +17,8 @@ from app.database_models import DatabaseManager, Boat, Beacon, BoatBeaconAssignm
 from app.fsm_engine import build_fsm_engine, IFSMEngine
 from app.entry_exit_fsm import FSMState
 from app.logging_config import get_logger
+from app.json_provider import install_json_provider
+from app.event_stream import get_event_broadcaster
 
 # Use the system logger
 logger = get_logger()
@@ -27,6 +29,7 @@ class APIServer:
                  inner_scanner_id: str = "gate-left"):
         self.app = Flask(__name__)
         CORS(self.app)
+        install_json_provider(self.app)
         
         self.db = DatabaseManager(db_path)
         # Use DoorLREngine for two-scanner door left/right configuration
@@ -41,6 +44,7 @@ class APIServer:
         )
         
         self._seen_live_beacons = set()  # beacon_ids with at least one live detection since start
+        self.events = get_event_broadcaster()  # pushes state changes to SSE clients
         self.setup_routes()
         self.setup_websocket_handlers()
         
@@ -124,13 +128,15 @@ class APIServer:
                         old_state, new_state = state_change
                         boat_name = assigned_boat.name if assigned_boat else "Unknown"
                         logger.info(f"Boat state change: {boat_name} ({mac_address}) - {old_state.value} → {new_state.value} (RSSI: {rssi} dBm)", "SCANNER")
-                        state_changes.append({
+                        change = {
                             'beacon_id': beacon.id,
                             'mac_address': mac_address,
                             'old_state': old_state.value,
                             'new_state': new_state.value,
                             'timestamp': datetime.now(timezone.utc).isoformat()
-                        , 'gate_id': gate_id, 'scanner_id': scanner_id })
+                        , 'gate_id': gate_id, 'scanner_id': scanner_id }
+                        state_changes.append(change)
+                        self.events.publish({'type': 'state_change', 'boat_id': assigned_boat.id, **change})
                     else:
                         # Log regular detection for assigned beacons
                         boat_name = assigned_boat.name if assigned_boat else "Unknown"
@@ -517,6 +523,12 @@ class APIServer:
                         self.db.update_beacon_state(beacon.id, DetectionState.EXITED, exit_timestamp=now_ts)
                         self.db.start_trip(boat.id, beacon.id, now_ts)
                         self.db.update_boat_status(boat.id, BoatStatus.OUT)
+                        self.events.publish({
+                            'type': 'OUT_SHED',
+                            'boat_id': boat.id,
+                            'beacon_id': beacon.id,
+                            'timestamp': now_ts.isoformat()
+                        })
                 
                 time.sleep(1)  # Update every 1 second for faster response
                 
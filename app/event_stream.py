@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+In-process event fan-out for Server-Sent Events
+The API server publishes boat state changes here; each connected dashboard
+client holds its own bounded queue and receives every event pushed after it
+subscribed.
+"""
+
+import queue
+import threading
+from typing import Dict, List
+
+
+class EventBroadcaster:
+    """Thread-safe publish/subscribe hub with one bounded queue per subscriber."""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: List[queue.Queue] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        """Register a new subscriber and return the queue it should read from."""
+        q: queue.Queue = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        """Remove a subscriber queue (no-op if already removed)."""
+        with self._lock:
+            try:
+                self._subscribers.remove(q)
+            except ValueError:
+                pass
+
+    def publish(self, event: Dict) -> None:
+        """Push an event to every subscriber; slow clients drop their oldest event."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                    q.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+# Global broadcaster instance (created eagerly so publisher/subscriber threads share it)
+broadcaster_instance = EventBroadcaster()
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Get the global event broadcaster instance."""
+    return broadcaster_instance
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+orjson-backed JSON provider for the Flask apps
+Installing it on an app routes every jsonify()/get_json() through orjson, so
+endpoints need no per-route changes. Falls back to Flask's stdlib provider
+when orjson is not installed.
+"""
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding/decoding.
+
+    Datetimes are passed through to DefaultJSONProvider.default so responses keep
+    Flask's existing format. Anything orjson refuses (e.g. ints wider than 64 bits)
+    and pretty-printed debug output go through the stdlib path.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        if 'indent' in kwargs:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def install_json_provider(app: Flask) -> None:
+    """Use orjson for all JSON on this app when it is available."""
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
@@ -173,6 +173,10 @@ class BoatTrackingLogger:
     def debug(self, message: str, component: str = "SYSTEM"):
         """Log debug message."""
         self.main_logger.debug(f"[{component}] {message}")
+
+    def debug_enabled(self) -> bool:
+        """Whether debug messages are emitted; lets hot paths skip building them."""
+        return self.main_logger.isEnabledFor(logging.DEBUG)
     
     def audit(self, action: str, user: str = "SYSTEM", details: str = ""):
         """Log audit trail entry."""
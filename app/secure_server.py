@@ -11,6 +11,7 @@ from werkzeug.serving import WSGIRequestHandler
 import threading
 import time
 from datetime import datetime, timezone
+from .json_provider import install_json_provider
 
 class SecureHTTPServer:
     """Enhanced HTTPS server with security features"""
@@ -151,6 +152,7 @@ class SecurityMiddleware:
 def create_secure_app():
     """Create Flask app with security features"""
     app = Flask(__name__)
+    install_json_provider(app)
     
     # Configure Flask for security
     app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', os.urandom(32).hex())
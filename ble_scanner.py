@@ -9,13 +9,16 @@ Extracts stable identifiers for reliable boat mapping:
 """
 
 import asyncio
+import struct
+import sys
 import time
 import threading
 import json
 import requests
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 from bleak import BleakScanner
 from app.logging_config import get_logger
 
@@ -24,13 +27,19 @@ logger = get_logger()
 
 # ---- Beacon protocol constants ----
 APPLE_CID = 0x004C  # iBeacon lives under Apple Manufacturer Specific Data
-EDDYSTONE_UUID = "0000feaa-0000-1000-8000-00805f9b34fb"  # 0xFEAA
+# Interned so equality checks against identical strings short-circuit on identity
+EDDYSTONE_UUID = sys.intern("0000feaa-0000-1000-8000-00805f9b34fb")  # 0xFEAA
 
 # Eddystone frame types
 EDDYSTONE_UID = 0x00
 EDDYSTONE_URL = 0x10
 # (0x20 TLM and 0x30 EID are ignored)
 
+# Fixed frame layouts, unpacked in one call without slicing
+_IBEACON = struct.Struct(">16sHHb")         # after 0x02 0x15: uuid, major, minor, tx_power
+_EDDYSTONE_UID_FRAME = struct.Struct(">b10s6s")  # after frame type: tx_power, namespace, instance
+_EDDYSTONE_URL_HEAD = struct.Struct(">bB")   # after frame type: tx_power, scheme
+
 # Eddystone URL decoding (per spec)
 URL_SCHEMES = {
     0x00: "http://www.",
@@ -44,6 +53,11 @@ URL_ENCODINGS = {
     0x07: ".com",  0x08: ".org",  0x09: ".edu",  0x0a: ".net",
     0x0b: ".info", 0x0c: ".biz",  0x0d: ".gov",
 }
+# Byte -> emitted text for every possible URL byte: expansion codes, printable
+# ASCII as-is, anything else dropped
+_URL_TABLE = tuple(
+    URL_ENCODINGS.get(b, chr(b) if 32 <= b <= 126 else "") for b in range(256)
+)
 
 @dataclass
 class DetectionObservation:
@@ -84,9 +98,13 @@ class ScannerConfig:
     active_window_seconds: int = 8  # Consider detections "active" within this many seconds
     adapter: str = None  # BLE adapter to use (e.g., 'hci0', 'hci1', 'hci2')
     rssi_bias_db: int = 0  # Software "power" tuning: positive makes scanner stricter, negative more permissive
+    coalesce_interval_s: float = 0.25  # Drop repeat adverts from a MAC arriving faster than this...
+    coalesce_rssi_db: int = 2  # ...unless RSSI moved by at least this many dB
 
 # ---------- Parsing helpers ----------
+@lru_cache(maxsize=256)
 def _fmt_uuid(b: bytes) -> str:
+    # Beacons repeat the same UUID every advert, so format each one only once
     h = b.hex()
     return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
 
@@ -97,31 +115,33 @@ def parse_ibeacon(mfg_payload: bytes) -> Optional[dict]:
     """
     if len(mfg_payload) < 23 or mfg_payload[0] != 0x02 or mfg_payload[1] != 0x15:
         return None
-    uuid = _fmt_uuid(mfg_payload[2:18])
-    major = int.from_bytes(mfg_payload[18:20], "big")
-    minor = int.from_bytes(mfg_payload[20:22], "big")
-    tx_power = int.from_bytes(mfg_payload[22:23], "big", signed=True)
+    uuid_bytes, major, minor, tx_power = _IBEACON.unpack_from(mfg_payload, 2)
+    uuid = _fmt_uuid(uuid_bytes)
     return {
         "protocol": "ibeacon",
         "stable_id": f"{uuid}:{major}:{minor}",
         "uuid": uuid, "major": major, "minor": minor, "tx_power": tx_power
     }
 
-def parse_eddystone(advertisement_data) -> Optional[dict]:
+def parse_eddystone(service_uuids, service_data) -> Optional[dict]:
     """
     Accept only Eddystone UID (0x00) and URL (0x10) frames.
     Ignore TLM/EID/unknown frames.
+    Takes the advert's service_uuids/service_data directly (already bound by the caller).
     """
-    uuids = (advertisement_data.service_uuids or [])
-    if EDDYSTONE_UUID not in [u.lower() for u in uuids]:
+    # bleak normally reports lowercase UUIDs, so try an exact match before lowercasing
+    uuids = service_uuids or []
+    if EDDYSTONE_UUID not in uuids and not any(u.lower() == EDDYSTONE_UUID for u in uuids):
         return None
 
-    sd = advertisement_data.service_data or {}
-    feaa = None
-    for k, v in sd.items():
-        if k.lower() == EDDYSTONE_UUID:
-            feaa = bytes(v)
-            break
+    sd = service_data or {}
+    feaa = sd.get(EDDYSTONE_UUID)
+    if feaa is None:
+        for k, v in sd.items():
+            if k.lower() == EDDYSTONE_UUID:
+                feaa = v
+                break
+    feaa = bytes(feaa) if feaa is not None else None
     if not feaa or len(feaa) < 1:
         return None
 
@@ -130,9 +150,9 @@ def parse_eddystone(advertisement_data) -> Optional[dict]:
     if ftype == EDDYSTONE_UID:
         if len(feaa) < 18:
             return None
-        tx_power = int.from_bytes(feaa[1:2], "big", signed=True)
-        namespace = feaa[2:12].hex()
-        instance  = feaa[12:18].hex()
+        tx_power, namespace_bytes, instance_bytes = _EDDYSTONE_UID_FRAME.unpack_from(feaa, 1)
+        namespace = namespace_bytes.hex()
+        instance  = instance_bytes.hex()
         return {
             "protocol": "eddystone-uid",
             "stable_id": f"{namespace}:{instance}",
@@ -142,11 +162,9 @@ def parse_eddystone(advertisement_data) -> Optional[dict]:
     if ftype == EDDYSTONE_URL:
         if len(feaa) < 3:
             return None
-        tx_power = int.from_bytes(feaa[1:2], "big", signed=True)
-        scheme = URL_SCHEMES.get(feaa[2], "")
-        url = scheme
-        for b in feaa[3:]:
-            url += URL_ENCODINGS[b] if b in URL_ENCODINGS else (chr(b) if 32 <= b <= 126 else "")
+        tx_power, scheme_code = _EDDYSTONE_URL_HEAD.unpack_from(feaa, 1)
+        scheme = URL_SCHEMES.get(scheme_code, "")
+        url = scheme + "".join([_URL_TABLE[b] for b in feaa[3:]])
         return {
             "protocol": "eddystone-url",
             "stable_id": url,
@@ -155,6 +173,26 @@ def parse_eddystone(advertisement_data) -> Optional[dict]:
     # TLM/EID/others -> ignore
     return None
 
+class _SharedScanLoop:
+    """One background asyncio loop shared by every BLEScanner in the process.
+
+    bleak is natively async, so several adapters can scan as tasks on a single
+    loop instead of each scanner spinning up its own thread + event loop.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ble-scan-loop", daemon=True).start()
+            return self._loop
+
+_scan_loop = _SharedScanLoop()
+
 class BLEScanner:
     def __init__(self, config: ScannerConfig):
         self.config = config
@@ -164,16 +202,32 @@ class BLEScanner:
         self.lock = threading.Lock()
         # Cached thresholds pulled from API
         self._api_rssi_threshold: Optional[int] = None
-        self._last_settings_fetch_ts: float = 0.0
+        self._last_settings_fetch_ts: float = float('-inf')  # time.monotonic() of last fetch attempt
+        self._settings_fetch_inflight = False
+        self._effective_threshold: int = self._compute_effective_threshold()
         self._settings_ttl_s: float = 10.0
+        # Per-MAC (monotonic ts, rssi) of the last accepted advert, used for coalescing
+        self._last_accepted: Dict[str, Tuple[float, int]] = {}
+        self._scan_future = None
+
+    def _refresh_fsm_settings(self) -> None:
+        """Start a background settings fetch once the cached copy is older than the TTL.
+
+        Runs on the shared scan loop, so the HTTP request goes to the default executor
+        and a slow or dead server never blocks adverts from any scanner.
+        """
+        # Called on every advert: the cache-hit path is one monotonic read and a compare
+        now = time.monotonic()
+        if self._settings_fetch_inflight or now - self._last_settings_fetch_ts < self._settings_ttl_s:
+            return
+        # Stamp the attempt rather than only successes, so a dead server is retried once per TTL
+        self._last_settings_fetch_ts = now
+        self._settings_fetch_inflight = True
+        asyncio.get_running_loop().run_in_executor(None, self._fetch_fsm_settings)
 
     def _fetch_fsm_settings(self) -> None:
         """Fetch FSM settings from API and cache them. Ignore errors silently."""
         try:
-            import requests, time
-            now = time.time()
-            if now - self._last_settings_fetch_ts < self._settings_ttl_s:
-                return
             url = f"{self.config.server_url}/api/v1/fsm-settings"
             resp = requests.get(url, timeout=1.5)
             if resp.ok:
@@ -181,50 +235,69 @@ class BLEScanner:
                 rt = data.get('rssi_threshold')
                 if isinstance(rt, int):
                     self._api_rssi_threshold = rt
+                    self._effective_threshold = self._compute_effective_threshold()
                 aw = data.get('active_window_seconds')
                 if isinstance(aw, int):
                     self.config.active_window_seconds = max(1, aw)
-                self._last_settings_fetch_ts = now
         except Exception:
             # Keep last known value
             pass
+        finally:
+            self._settings_fetch_inflight = False
+
+    def _compute_effective_threshold(self) -> int:
+        # Prefer API value; fallback to legacy config default -80
+        base_threshold = self._api_rssi_threshold if isinstance(self._api_rssi_threshold, int) else (
+            self.config.rssi_threshold if isinstance(self.config.rssi_threshold, int) else -80
+        )
+        # Apply software bias to emulate scan power tuning
+        return base_threshold + self.config.rssi_bias_db
 
     def detection_callback(self, device, advertisement_data):
         """
         Accept **only** iBeacon or Eddystone (UID/URL).
         Extract a stable ID + include MAC and Name for boat mapping.
         """
+        ad = advertisement_data
         # Prefer RSSI from advertisement; fall back to device RSSI if missing
-        rssi = getattr(advertisement_data, 'rssi', None)
+        rssi = getattr(ad, 'rssi', None)
         if rssi is None:
             rssi = getattr(device, 'rssi', None)
         if rssi is None:
             logger.debug(f"Skipping advertisement with no RSSI for {getattr(device, 'address', 'unknown')}", "SCANNER")
             return
         # Refresh FSM-controlled threshold periodically
-        self._fetch_fsm_settings()
-        # Determine effective threshold: prefer API value; fallback to legacy config default -80
-        base_threshold = self._api_rssi_threshold if isinstance(self._api_rssi_threshold, int) else (
-            self.config.rssi_threshold if isinstance(self.config.rssi_threshold, int) else -80
-        )
-        # Apply software bias to emulate scan power tuning
-        effective_threshold = base_threshold + self.config.rssi_bias_db
+        self._refresh_fsm_settings()
+        # Weak adverts are the common case: reject them before any timestamp,
+        # parsing or message formatting
+        effective_threshold = self._effective_threshold
         if rssi < effective_threshold:
-            logger.debug(
-                f"Ignoring {getattr(device, 'address', 'unknown')} due to RSSI {rssi}dBm < threshold {effective_threshold}dBm",
-                "SCANNER"
-            )
+            if logger.debug_enabled():
+                logger.debug(
+                    f"Ignoring {getattr(device, 'address', 'unknown')} due to RSSI {rssi}dBm < threshold {effective_threshold}dBm",
+                    "SCANNER"
+                )
             return
 
         mac = device.address
-        name = getattr(advertisement_data, 'local_name', None) or device.name or "Unknown"
+        # Coalesce advert bursts: skip repeats from the same MAC inside the coalesce
+        # window unless the RSSI changed meaningfully
+        now_mono = time.monotonic()
+        last = self._last_accepted.get(mac)
+        if (last is not None
+                and now_mono - last[0] < self.config.coalesce_interval_s
+                and abs(rssi - last[1]) < self.config.coalesce_rssi_db):
+            return
+        self._last_accepted[mac] = (now_mono, rssi)
+
+        name = getattr(ad, 'local_name', None) or device.name or "Unknown"
         ts = time.time()
 
         obs: Optional[DetectionObservation] = None
 
         # Try iBeacon (Apple 0x004C)
         try:
-            mfg = advertisement_data.manufacturer_data or {}
+            mfg = ad.manufacturer_data or {}
             apple_payload = mfg.get(APPLE_CID)
             if apple_payload:
                 parsed = parse_ibeacon(bytes(apple_payload))
@@ -245,7 +318,7 @@ class BLEScanner:
         # Else try Eddystone UID/URL
         if obs is None:
             try:
-                edd = parse_eddystone(advertisement_data)
+                edd = parse_eddystone(ad.service_uuids, ad.service_data)
             except Exception as e:
                 logger.debug(f"Eddystone parse error for {mac}: {e}", "SCANNER")
                 edd = None
@@ -270,7 +343,8 @@ class BLEScanner:
 
         # If neither matched, ignore (non-beacon or unsupported Eddystone frame)
         if obs is None:
-            logger.debug(f"Unsupported frame for {mac} - not iBeacon/Eddystone UID/URL", "SCANNER")
+            if logger.debug_enabled():
+                logger.debug(f"Unsupported frame for {mac} - not iBeacon/Eddystone UID/URL", "SCANNER")
             return
 
         with self.lock:
@@ -281,17 +355,23 @@ class BLEScanner:
             # Log beacon detection
             logger.info(f"BLE beacon detected: {name} ({mac}) - {obs.protocol} - RSSI: {rssi} dBm", "SCANNER")
             
-            if len(self.observation_queue) >= self.config.batch_size:
-                self._process_observations()
+            batch = self._drain_observations() if len(self.observation_queue) >= self.config.batch_size else None
+
+        if batch:
+            # POST off the shared scan loop so other scanners keep receiving adverts
+            asyncio.get_running_loop().run_in_executor(None, self._process_observations, batch)
 
-    def _process_observations(self):
+    def _drain_observations(self) -> List[DetectionObservation]:
+        """Take everything queued so far. Caller must hold self.lock."""
+        observations = self.observation_queue
+        self.observation_queue = []
+        return observations
+
+    def _process_observations(self, observations: List[DetectionObservation]):
         """Send or print a batch of observations."""
-        if not self.observation_queue:
+        if not observations:
             return
 
-        observations = self.observation_queue.copy()
-        self.observation_queue.clear()
-
         payload = {
             "scanner_id": self.config.scanner_id,
             "gate_id": self.config.gate_id,
@@ -359,44 +439,52 @@ class BLEScanner:
         retry_count = 0
         max_retries = 5
         
-        while self.running and retry_count < max_retries:
-            try:
-                scanner = BleakScanner(self.detection_callback, **scanner_kwargs)
-                await scanner.start()
-                logger.info("BLE scanner started successfully", "SCANNER")
-                self.running = True
-                retry_count = 0  # Reset retry count on successful start
-
-                while self.running:
-                    await asyncio.sleep(self.config.scan_interval)
-                    with self.lock:
-                        # Prune stale detections so UI reflects beacons that are truly active now
-                        now_ts = time.time()
-                        stale_keys = [mac for mac, obs in self.detected_beacons.items()
-                                      if obs.ts is None or (now_ts - obs.ts) > self.config.active_window_seconds]
-                        for mac in stale_keys:
-                            self.detected_beacons.pop(mac, None)
-                        if self.observation_queue:
-                            self._process_observations()
+        try:
+            while self.running and retry_count < max_retries:
+                try:
+                    scanner = BleakScanner(self.detection_callback, **scanner_kwargs)
+                    await scanner.start()
+                    logger.info("BLE scanner started successfully", "SCANNER")
+                    self.running = True
+                    retry_count = 0  # Reset retry count on successful start
+
+                    while self.running:
+                        await asyncio.sleep(self.config.scan_interval)
+                        with self.lock:
+                            # Prune stale detections so UI reflects beacons that are truly active now
+                            now_ts = time.time()
+                            stale_keys = [mac for mac, obs in self.detected_beacons.items()
+                                          if obs.ts is None or (now_ts - obs.ts) > self.config.active_window_seconds]
+                            for mac in stale_keys:
+                                self.detected_beacons.pop(mac, None)
+                            # Forget coalescing state for MACs that have gone quiet
+                            now_mono = time.monotonic()
+                            quiet_keys = [mac for mac, (seen, _) in self._last_accepted.items()
+                                          if (now_mono - seen) > self.config.active_window_seconds]
+                            for mac in quiet_keys:
+                                self._last_accepted.pop(mac, None)
+                            batch = self._drain_observations()
+                        if batch:
+                            await asyncio.get_running_loop().run_in_executor(None, self._process_observations, batch)
                             
-            except Exception as e:
-                retry_count += 1
-                logger.error(f"BLE scan error (attempt {retry_count}/{max_retries}): {e}", "SCANNER")
+                except Exception as e:
+                    retry_count += 1
+                    logger.error(f"BLE scan error (attempt {retry_count}/{max_retries}): {e}", "SCANNER")
                 
-                if scanner:
-                    try:
-                        await scanner.stop()
-                    except Exception:
-                        pass
-                    scanner = None
+                    if scanner:
+                        try:
+                            await scanner.stop()
+                        except Exception:
+                            pass
+                        scanner = None
                 
-                if retry_count < max_retries:
-                    wait_time = min(2 ** retry_count, 30)  # Exponential backoff, max 30 seconds
-                    logger.info(f"Retrying in {wait_time} seconds...", "SCANNER")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"Max retries reached. Scanner {self.config.scanner_id} failed permanently.", "SCANNER")
-                    break
+                    if retry_count < max_retries:
+                        wait_time = min(2 ** retry_count, 30)  # Exponential backoff, max 30 seconds
+                        logger.info(f"Retrying in {wait_time} seconds...", "SCANNER")
+                        await asyncio.sleep(wait_time)
+                    else:
+                        logger.error(f"Max retries reached. Scanner {self.config.scanner_id} failed permanently.", "SCANNER")
+                        break
                     
         finally:
             self.running = False
@@ -408,17 +496,18 @@ class BLEScanner:
             logger.info("BLE scanner stopped", "SCANNER")
 
     def start_scanning(self):
-        """Start BLE scanning in a separate thread."""
-        def run_scanner():
-            asyncio.run(self.scan_continuously())
-        self.scanner_thread = threading.Thread(target=run_scanner, daemon=True)
-        self.scanner_thread.start()
+        """Start BLE scanning as a task on the shared scan loop."""
+        self.running = True
+        self._scan_future = asyncio.run_coroutine_threadsafe(self.scan_continuously(), _scan_loop.get_loop())
 
     def stop_scanning(self):
         """Stop BLE scanning."""
         self.running = False
-        if hasattr(self, 'scanner_thread'):
-            self.scanner_thread.join(timeout=5)
+        if self._scan_future is not None:
+            try:
+                self._scan_future.result(timeout=5)
+            except Exception:
+                pass
 
     def get_detected_beacons(self) -> Dict[str, DetectionObservation]:
         """Get currently detected beacons."""
@@ -5,6 +5,7 @@ Manages scanners, API server, and web dashboard
 """
 
 import os
+import queue
 import time
 import threading
 import logging
@@ -14,7 +15,7 @@ import subprocess
 import sys
 import traceback
 from typing import List, Optional
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, render_template_string, jsonify, request, stream_with_context
 from datetime import datetime, timezone, timedelta
 try:
     from zoneinfo import ZoneInfo
@@ -27,6 +28,8 @@ from ble_scanner import BLEScanner, ScannerConfig
 from api_server import APIServer
 from app import admin_service
 from app.logging_config import get_logger, setup_logging
+from app.json_provider import install_json_provider
+from app.event_stream import get_event_broadcaster
 from app.emergency_system import EmergencyNotificationSystem, register_emergency_api
 
 # Setup comprehensive logging
@@ -236,6 +239,7 @@ class BoatTrackingSystem:
             if display_mode in ['web', 'both']:
                 self.web_app = Flask(__name__)
                 CORS(self.web_app)
+                install_json_provider(self.web_app)
                 self.setup_web_routes()
                 
                 # Register emergency notification API routes
@@ -605,6 +609,35 @@ class BoatTrackingSystem:
             except Exception as e:
                 return jsonify({'error': str(e)}), 500
         
+        @self.web_app.route('/api/events')
+        def api_event_stream():
+            """Server-Sent Events stream of boat state changes.
+            Clients refresh on each event instead of polling at a fixed rate; a comment
+            line is sent every 15s so proxies keep the connection open.
+            """
+            events = get_event_broadcaster()
+            dumps = self.web_app.json.dumps
+
+            def stream():
+                q = events.subscribe()
+                try:
+                    yield "retry: 3000\n\n"
+                    while True:
+                        try:
+                            event = q.get(timeout=15)
+                        except queue.Empty:
+                            yield ": keepalive\n\n"
+                            continue
+                        yield f"data: {dumps(event)}\n\n"
+                finally:
+                    events.unsubscribe(q)
+
+            return Response(
+                stream_with_context(stream()),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
         @self.web_app.route('/api/presence')
         def api_presence():
             """Get current presence status.
@@ -2985,8 +3018,23 @@ class BoatTrackingSystem:
             return pct;
         }
         
-        // Update every 1 second for faster UI reflection
-        setInterval(updateAllData, 1000);
+        // Live updates: refresh immediately on every pushed state change. While the
+        // event stream is connected, a slow poll keeps RSSI/last-seen fresh; if it
+        // drops (or EventSource is unavailable) fall back to 1 second polling.
+        const FAST_POLL_MS = 1000;
+        const SLOW_POLL_MS = 10000;
+        let pollTimer = null;
+        function setPollInterval(ms) {
+            if (pollTimer) clearInterval(pollTimer);
+            pollTimer = setInterval(updateAllData, ms);
+        }
+        setPollInterval(FAST_POLL_MS);
+        if (window.EventSource) {
+            const stream = new EventSource('/api/events');
+            stream.onopen = () => setPollInterval(SLOW_POLL_MS);
+            stream.onmessage = () => updateAllData();
+            stream.onerror = () => setPollInterval(FAST_POLL_MS);
+        }
         
         // Initial load
         updateAllData();
@@ -19,6 +19,7 @@ from app.secure_server import SecureHTTPServer, create_secure_app
 # Import existing modules
 from app.database_models import DatabaseManager
 from app.logging_config import get_logger
+from app.json_provider import install_json_provider
 from ble_scanner import BLEScanner
 from api_server import APIServer
 
@@ -65,6 +66,7 @@ class SecureBoatTrackingSystem:
                 from flask_cors import CORS
                 self.web_app = Flask(__name__)
                 CORS(self.web_app)
+                install_json_provider(self.web_app)
                 self._setup_standard_routes()
         else:
             self.web_app = None
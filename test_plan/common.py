@@ -6,7 +6,7 @@ Common helpers for test_plan benchmarks:
 - Filtering (median + EWMA), trend, visuals
 """
 
-import os, math, random
+import os, math
 from collections import deque, namedtuple
 from dataclasses import dataclass
 from typing import List, Tuple
@@ -14,7 +14,17 @@ from typing import List, Tuple
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy.signal import medfilt
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; kernels then run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
 
 
 def ensure_dir(path: str) -> str:
@@ -22,62 +32,140 @@ def ensure_dir(path: str) -> str:
     return os.path.abspath(path)
 
 
-def savefig(path: str):
+def savefig(path: str, dpi=160, tight=False):
+    """Save and close the current figure.
+
+    Uses fixed margins by default; pass tight=True to run the (much slower)
+    tight_layout solver for figures whose labels need it. Sweeps can lower dpi.
+    """
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    plt.tight_layout()
-    plt.savefig(path, dpi=160)
+    if tight:
+        plt.tight_layout()
+    else:
+        plt.subplots_adjust(left=0.12, right=0.96, top=0.92, bottom=0.12)
+    plt.savefig(path, dpi=dpi)
     plt.close()
 
 
-def ewma(x, alpha, y0=None):
-    out = np.empty_like(x, dtype=float)
-    y = x[0] if y0 is None else y0
-    for i, xi in enumerate(x):
-        y = alpha * xi + (1 - alpha) * y
+@njit(cache=True, fastmath=True)
+def _ewma_kernel(x, alpha, y0):
+    out = np.empty(x.shape[0], dtype=np.float64)
+    y = y0
+    for i in range(x.shape[0]):
+        y = alpha * x[i] + (1.0 - alpha) * y
         out[i] = y
     return out
 
 
+def ewma(x, alpha, y0=None):
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    return _ewma_kernel(x, float(alpha), float(x[0] if y0 is None else y0))
+
+
+# Pay the JIT compile cost at import rather than inside the first trial
+ewma(np.zeros(2), 0.5)
+
+
+# Optimal 9-comparator sorting network for 5 elements
+_SORT5_NET = ((0, 1), (3, 4), (2, 4), (2, 3), (0, 3), (0, 2), (1, 4), (1, 3), (1, 2))
+
+
+@njit(cache=True)
+def _medfilt5_kernel(x):
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    w = np.empty(5, dtype=np.float64)
+    for i in range(n):
+        for j in range(5):
+            idx = i + j - 2
+            w[j] = x[idx] if 0 <= idx < n else 0.0
+        for a, b in _SORT5_NET:
+            lo = min(w[a], w[b])
+            hi = max(w[a], w[b])
+            w[a] = lo
+            w[b] = hi
+        out[i] = w[2]
+    return out
+
+
+def medfilt5(x):
+    """Sliding 5-sample median, zero-padded at the edges like scipy's medfilt."""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if HAVE_NUMBA or x.shape[0] == 0:
+        return _medfilt5_kernel(x)
+    # Without the JIT the sorting network is a slow Python loop; sort all windows at once
+    win = np.lib.stride_tricks.sliding_window_view(np.pad(x, 2), 5)
+    return np.sort(win, axis=1)[:, 2]
+
+
 def derivative(y, t, span_s=1.0):
     out = np.zeros_like(y, dtype=float)
     n = len(y)
     if n < 2:
         return out
+    y = np.asarray(y, dtype=float)
+    t = np.asarray(t, dtype=float)
     dt = t[1] - t[0]
     k = max(1, int(round(span_s / dt)))
-    for i in range(n):
-        j = max(0, i - k)
-        if t[i] == t[j]:
-            out[i] = 0.0
-        else:
-            out[i] = (y[i] - y[j]) / (t[i] - t[j])
+    # Fixed-lag difference against sample i-k (clamped to the first sample)
+    j = np.maximum(np.arange(n) - k, 0)
+    dy = y - y[j]
+    dtt = t - t[j]
+    np.divide(dy, dtt, out=out, where=dtt != 0)
     return out
 
 
 Phase = namedtuple("Phase", "name dur_s rssi_S1 rssi_S2 note")
 
 
-def _rssi(v):
-    return (lambda s: v(s)) if callable(v) else (lambda s: v)
+def _phase_base(v, steps, dt):
+    """Mean RSSI per step for one scanner in a phase (NaN where not visible)."""
+    if callable(v):
+        vals = (v(k * dt) for k in range(steps))
+        return np.fromiter((np.nan if b is None else b for b in vals), dtype=float, count=steps)
+    return np.full(steps, np.nan if v is None else v, dtype=float)
+
+
+def _generate_trace_arrays(phases: List[Phase], dt=0.2, noise_sigma=2.0, dropout=0.0, seed=1):
+    """Raw trace as typed arrays: (t, scanner (int8, 0=S1 1=S2), rssi, phase index)."""
+    rng = np.random.default_rng(seed)
+    phase_steps = [int(round(p.dur_s / dt)) for p in phases]
+    total = sum(phase_steps)
+    # Same values as accumulating t += dt sample by sample
+    times = np.cumsum(np.concatenate(([0.0], np.full(max(total - 1, 0), dt))))[:total]
+
+    # Preallocated (total, 2) grid of mean RSSI, one column per scanner, plus the
+    # phase index of every step; phases fill their slice in place
+    base = np.empty((total, 2), dtype=float)
+    phase_idx = np.empty(total, dtype=np.intp)
+    start = 0
+    for i, (p, steps) in enumerate(zip(phases, phase_steps)):
+        if steps <= 0:
+            continue
+        base[start:start + steps, 0] = _phase_base(p.rssi_S1, steps, dt)
+        base[start:start + steps, 1] = _phase_base(p.rssi_S2, steps, dt)
+        phase_idx[start:start + steps] = i
+        start += steps
+
+    keep = ~np.isnan(base) & (rng.random((total, 2)) > dropout)
+    rssi = base + noise_sigma * rng.standard_normal((total, 2))
+    # Flatten row-major so samples stay interleaved S1, S2 per timestamp
+    keep = keep.ravel()
+    row_step = np.repeat(np.arange(total), 2)[keep]
+    scanner = np.tile(np.array([0, 1], dtype=np.int8), total)[keep]
+    return times[row_step], scanner, rssi.ravel()[keep], phase_idx[row_step]
 
 
 def generate_trace(phases: List[Phase], dt=0.2, noise_sigma=2.0, dropout=0.0, seed=1):
-    rng = random.Random(seed)
-    rows = []
-    t = 0.0
-    for p in phases:
-        steps = int(round(p.dur_s / dt))
-        r1 = _rssi(p.rssi_S1)
-        r2 = _rssi(p.rssi_S2)
-        for k in range(steps):
-            base1 = r1(k * dt)
-            base2 = r2(k * dt)
-            if base1 is not None and rng.random() > dropout:
-                rows.append([t, "S1", "B1", base1 + rng.gauss(0, noise_sigma), p.name])
-            if base2 is not None and rng.random() > dropout:
-                rows.append([t, "S2", "B1", base2 + rng.gauss(0, noise_sigma), p.name])
-            t += dt
-    df = pd.DataFrame(rows, columns=["t", "scanner", "beacon", "rssi", "gt_state"])
+    t, scanner, rssi, gt_idx = _generate_trace_arrays(phases, dt, noise_sigma, dropout, seed)
+    names = np.array([p.name for p in phases], dtype=object)
+    df = pd.DataFrame({
+        "t": t,
+        "scanner": np.array(["S1", "S2"], dtype=object)[scanner],
+        "beacon": "B1",
+        "rssi": rssi,
+        "gt_state": names[gt_idx],
+    })
     return df
 
 
@@ -181,46 +269,157 @@ class BeaconFSM:
         return self.state
 
 
+# Batch FSM: same transitions as BeaconFSM.step, with states as int codes and the
+# ten RollingBool windows as int8 ring buffers with running sums
+STATE_NAMES = ("INSIDE", "MOVING", "AT_GATE", "EXITING", "OUTSIDE", "ENTERING")
+_S1s, _S2s, _S1w, _S2w, _S1a, _S2a, _S1r, _S2r, _Dpos, _Dneg = range(10)
+
+
+@njit(cache=True)
+def _fsm_kernel(T, F1, F2, V1, V2, n, k, s1_high, s1_low, s2_high, s2_low, v_th, d_pos, d_neg):
+    m = T.shape[0]
+    states = np.empty(m, dtype=np.int8)
+    buf = np.zeros((10, n), dtype=np.int8)
+    sums = np.zeros(10, dtype=np.int64)
+    flags = np.zeros(10, dtype=np.int8)
+    head = 0
+    st = 0
+    last_in = np.nan
+    last_out = np.nan
+    for i in range(m):
+        # NaN means "no reading"; every comparison against NaN is False
+        f1 = F1[i]; f2 = F2[i]; v1 = V1[i]; v2 = V2[i]
+        d = f2 - f1
+        flags[_S1s] = f1 >= s1_high
+        flags[_S2s] = f2 >= s2_high
+        flags[_S1w] = np.isnan(f1) or f1 <= s1_low
+        flags[_S2w] = np.isnan(f2) or f2 <= s2_low
+        flags[_S1a] = v1 >= v_th
+        flags[_S2a] = v2 >= v_th
+        flags[_S1r] = v1 <= -v_th
+        flags[_S2r] = v2 <= -v_th
+        flags[_Dpos] = d >= d_pos
+        flags[_Dneg] = d <= d_neg
+        for r in range(10):
+            sums[r] += flags[r] - buf[r, head]
+            buf[r, head] = flags[r]
+        head = (head + 1) % n
+
+        if st == 0:  # INSIDE
+            if sums[_S1s] >= k and (sums[_S1a] >= k or sums[_Dpos] >= k):
+                st = 1
+        elif st == 1:  # MOVING
+            if sums[_S2s] >= k:
+                st = 2
+            elif sums[_S1w] >= k:
+                st = 0
+        elif st == 2:  # AT_GATE
+            if (sums[_S2a] >= k and sums[_S1r] >= k) or sums[_Dpos] >= k:
+                st = 3
+        elif st == 3:  # EXITING
+            if sums[_S1w] >= k and sums[_S2s] >= k:
+                last_out = T[i]
+                st = 4
+            elif sums[_S2w] >= k:
+                st = 2
+        elif st == 4:  # OUTSIDE
+            if (sums[_S2a] >= k and not sums[_S1w] >= k) or sums[_Dneg] >= k:
+                st = 5
+        elif st == 5:  # ENTERING
+            if sums[_S2w] >= k and sums[_S1s] >= k:
+                last_in = T[i]
+                st = 0
+        states[i] = st
+    return states, last_in, last_out
+
+
+def run_fsm(T, F1, F2, V1, V2, params: FSMParams, dt=0.2):
+    """Evaluate a fresh BeaconFSM over whole arrays (NaN = missing reading).
+
+    Returns (state_codes, fsm) where fsm carries the final state, last_in and
+    last_out exactly as stepping BeaconFSM sample by sample would. Without
+    numba the kernel is no faster than BeaconFSM.step, so it steps the FSM.
+    """
+    if not HAVE_NUMBA:
+        fsm = BeaconFSM(params, dt=dt)
+        code = {name: i for i, name in enumerate(STATE_NAMES)}
+        codes = np.empty(len(T), dtype=np.int8)
+        for i, tt in enumerate(T):
+            f1 = None if np.isnan(F1[i]) else float(F1[i])
+            f2 = None if np.isnan(F2[i]) else float(F2[i])
+            v1 = None if np.isnan(F1[i]) else float(V1[i])
+            v2 = None if np.isnan(F2[i]) else float(V2[i])
+            codes[i] = code[fsm.step(tt, f1, f2, v1, v2)]
+        return codes, fsm
+    F1 = np.ascontiguousarray(F1, dtype=np.float64)
+    F2 = np.ascontiguousarray(F2, dtype=np.float64)
+    # Velocity only counts while its filtered RSSI is present
+    V1 = np.where(np.isnan(F1), np.nan, V1)
+    V2 = np.where(np.isnan(F2), np.nan, V2)
+    p = params
+    codes, last_in, last_out = _fsm_kernel(
+        np.ascontiguousarray(T, dtype=np.float64), F1, F2, V1, V2,
+        max(1, int(round(p.WIN_S / dt))), p.CONFIRM_K,
+        float(p.S1_HIGH), float(p.S1_LOW), float(p.S2_HIGH), float(p.S2_LOW),
+        float(p.V_TH), float(p.DELTA_POS), float(p.DELTA_NEG),
+    )
+    fsm = BeaconFSM(params, dt=dt)
+    if len(codes):
+        fsm.state = STATE_NAMES[codes[-1]]
+    fsm.last_in = None if np.isnan(last_in) else float(last_in)
+    fsm.last_out = None if np.isnan(last_out) else float(last_out)
+    return codes, fsm
+
+
 def _clean_series(x):
     xn = x.copy()
     s = pd.Series(xn).interpolate(limit=3).bfill().ffill().values
-    med = medfilt(s, kernel_size=5)
+    med = medfilt5(s)
     f = ewma(med, alpha=0.35)
     f[np.isnan(xn)] = np.nan
     return f
 
 
 def run_trial(phases: List[Phase], out_dir: str, noise_sigma=2.0, dropout=0.0, dt=0.2, seed=1,
-              params: FSMParams = FSMParams()):
-    out_dir = ensure_dir(out_dir)
-    df = generate_trace(phases, dt=dt, noise_sigma=noise_sigma, dropout=dropout, seed=seed)
-    t = sorted(df.t.unique())
-    T = np.array(t)
-
-    def series(scanner):
-        m = {row.t: row.rssi for row in df.itertuples() if row.scanner == scanner}
-        return np.array([m.get(tt, np.nan) for tt in T])
-
-    S1 = series("S1"); S2 = series("S2")
+              params: FSMParams = FSMParams(), log_format="csv", write_log=True):
+    """Simulate one trace through the filters + FSM and write the per-sample log.
+
+    log_format: "csv" (log.csv) or "parquet" (log.parquet, zstd via pyarrow; much
+    faster to write for long traces).
+    write_log: set False in sweeps that call run_trial repeatedly with the same
+    out_dir, where each write would just overwrite the previous one.
+    """
+    if log_format not in ("csv", "parquet"):
+        raise ValueError(f"log_format must be 'csv' or 'parquet', got {log_format!r}")
+    t, scanner, rssi, gt_idx = _generate_trace_arrays(phases, dt=dt, noise_sigma=noise_sigma,
+                                                      dropout=dropout, seed=seed)
+    # Scatter samples onto the sorted unique-timestamp grid; missing samples stay NaN
+    T, slot = np.unique(t, return_inverse=True)
+    S1 = np.full(len(T), np.nan); S2 = np.full(len(T), np.nan)
+    is_s1 = scanner == 0
+    S1[slot[is_s1]] = rssi[is_s1]
+    S2[slot[~is_s1]] = rssi[~is_s1]
+    gt = np.empty(len(T), dtype=np.intp)
+    gt[slot] = gt_idx
     F1 = _clean_series(S1); F2 = _clean_series(S2)
     V1 = derivative(np.nan_to_num(F1, nan=F1[~np.isnan(F1)][0]), T, span_s=1.0)
     V2 = derivative(np.nan_to_num(F2, nan=F2[~np.isnan(F2)][0]), T, span_s=1.0)
 
-    fsm = BeaconFSM(params, dt=dt)
-    states = []
-    for i, tt in enumerate(T):
-        f1 = None if np.isnan(F1[i]) else float(F1[i])
-        f2 = None if np.isnan(F2[i]) else float(F2[i])
-        v1 = None if np.isnan(F1[i]) else float(V1[i])
-        v2 = None if np.isnan(F2[i]) else float(V2[i])
-        states.append(fsm.step(tt, f1, f2, v1, v2))
+    codes, fsm = run_fsm(T, F1, F2, V1, V2, params, dt=dt)
+    states = np.asarray(STATE_NAMES)[codes]
 
     out_df = pd.DataFrame({
         "t": T,
-        "gt": df.drop_duplicates("t").set_index("t").gt_state.reindex(T).bfill().ffill().values,
+        "gt": np.array([p.name for p in phases], dtype=object)[gt],
         "S1": S1, "S2": S2, "F1": F1, "F2": F2, "V1": V1, "V2": V2, "state": states,
     })
-    out_df.to_csv(os.path.join(out_dir, "log.csv"), index=False)
+    if not write_log:
+        return out_df, fsm
+    out_dir = ensure_dir(out_dir)
+    if log_format == "parquet":
+        out_df.to_parquet(os.path.join(out_dir, "log.parquet"), engine="pyarrow", compression="zstd", index=False)
+    else:
+        out_df.to_csv(os.path.join(out_dir, "log.csv"), index=False)
     return out_df, fsm
 
 
@@ -10,20 +10,38 @@ import json
 import os
 import sys
 import time
-import random
+import hashlib
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Tuple
 
 try:
+    import matplotlib
+    matplotlib.use("Agg")  # headless: figures are only ever saved to disk
     import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
     import numpy as np
 except Exception as e:
     print("ERROR: matplotlib and numpy required. Try: pip install matplotlib numpy", file=sys.stderr)
     raise
 
+plt.ioff()
+plt.rcParams['figure.max_open_warning'] = 0
 
-def iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+SCANNER_IDS = np.array(["gate-inner", "gate-outer"])
+
+# Per-sample columns and their dtypes; each is one NumPy array covering every sample of the run
+SAMPLE_COLUMNS = {
+    "timestamp": "datetime64[us]",
+    "trial": np.int32,
+    "sample_idx": np.int32,
+    "boat_in_harbor": np.bool_,
+    "confidence": np.float32,
+    "rssi": np.float32,
+    "scanner_id": np.uint8,
+}
+
+JSONL_CHUNK_LINES = 1000
 
 
 def generate_realistic_scenarios() -> List[Dict]:
@@ -124,29 +142,36 @@ def generate_realistic_scenarios() -> List[Dict]:
     return scenarios
 
 
-def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[Dict, List[Dict]]:
-    """Generate realistic trial data for a given scenario."""
+def trial_rng(boat_id: str, trial_num: int, seed: int) -> np.random.Generator:
+    """Per-trial generator derived from (boat_id, trial, seed) so reruns reproduce each trial."""
+    h = hashlib.md5(f"{boat_id}|{trial_num}|{seed}".encode()).digest()
+    return np.random.default_rng(int.from_bytes(h[:8], 'big'))
+
+
+def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str, seed: int) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Generate realistic trial data for a given scenario (samples returned as columns)."""
+    rng = trial_rng(boat_id, trial_num, seed)
     
     # Determine if this trial passes based on success rate
-    passes = random.random() < scenario["success_rate"]
+    passes = rng.random() < scenario["success_rate"]
     
     # Generate observed result
     if passes:
         observed = scenario["expected"]
         # Add some realistic variation in confidence
-        confidence = random.uniform(*scenario["confidence_range"])
+        confidence = rng.uniform(*scenario["confidence_range"])
     else:
         # Realistic failure modes
         if scenario["expected"] == "In Shed":
             observed = "On Water"  # False negative - boat not detected in shed
-            confidence = random.uniform(0.45, 0.65)  # Lower confidence for failures
+            confidence = rng.uniform(0.45, 0.65)  # Lower confidence for failures
         else:
             observed = "In Shed"   # False positive - boat detected in shed when on water
-            confidence = random.uniform(0.40, 0.60)  # Lower confidence for failures
+            confidence = rng.uniform(0.40, 0.60)  # Lower confidence for failures
     
-    # Generate realistic timing
-    start_time = datetime.now() - timedelta(minutes=scenario["duration_minutes"])
+    # Generate realistic timing (one clock read per trial)
     end_time = datetime.now()
+    start_time = end_time - timedelta(minutes=scenario["duration_minutes"])
     
     # Generate dashboard/log status
     if passes:
@@ -173,143 +198,152 @@ def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[D
         "comments_defects": "" if passes else f"Detection error in {scenario['description']}",
         "confidence": confidence,
         "description": scenario["description"],
-        "timestamp": iso_now()
+        "timestamp": end_time.astimezone(timezone.utc).isoformat()
     }
     
-    # Generate sample data for this trial
-    samples = []
-    samples_per_trial = scenario["duration_minutes"] * 12  # 12 samples per minute (5s intervals)
+    # Generate sample data for this trial (whole trial drawn in one batch)
+    n = scenario["duration_minutes"] * 12  # 12 samples per minute (5s intervals)
     
     base_state = 1 if scenario["expected"] == "In Shed" else 0
     
-    for sample_idx in range(samples_per_trial):
-        # Add realistic variation
-        if passes:
-            # Mostly correct with occasional noise
-            if random.random() < 0.08:  # 8% noise for successful trials
-                sample_state = 1 - base_state
-            else:
-                sample_state = base_state
-        else:
-            # More variation for failed trials
-            if random.random() < 0.25:  # 25% noise for failed trials
-                sample_state = 1 - base_state
-            else:
-                sample_state = base_state
-        
-        # Add some realistic timing variation
-        sample_time = start_time + timedelta(seconds=sample_idx * 5)
-        
-        sample = {
-            "timestamp": sample_time.isoformat(),
-            "trial": trial_num,
-            "expected": scenario["expected"],
-            "description": scenario["description"],
-            "sample_idx": sample_idx,
-            "boat_in_harbor": sample_state == 1,
-            "confidence": confidence + random.uniform(-0.05, 0.05),
-            "rssi": random.uniform(-45, -75) if sample_state == 1 else random.uniform(-60, -85),
-            "scanner_id": random.choice(["gate-inner", "gate-outer"])
-        }
-        samples.append(sample)
+    # Mostly correct with occasional noise: 8% for successful trials, 25% for failed ones
+    flip = rng.random(n) < (0.08 if passes else 0.25)
+    states = base_state ^ flip
+    rssi = np.where(states == 1, rng.uniform(-75, -45, n), rng.uniform(-85, -60, n))
+    conf = confidence + rng.uniform(-0.05, 0.05, n)
+    scanners = rng.integers(0, len(SCANNER_IDS), size=n, dtype=np.uint8)
+    
+    samples = {
+        "timestamp": np.datetime64(start_time, "us") + np.arange(n) * np.timedelta64(5, "s"),
+        "trial": np.full(n, trial_num, dtype=np.int32),
+        "sample_idx": np.arange(n, dtype=np.int32),
+        "boat_in_harbor": states == 1,
+        "confidence": conf.astype(np.float32),
+        "rssi": rssi.astype(np.float32),
+        "scanner_id": scanners
+    }
     
     return trial_result, samples
 
 
-def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
-    """Create professional plot suitable for official documentation."""
-    
-    # Parse data with trial information
+def build_trial_data(samples: Dict[str, np.ndarray], results: List[Dict]) -> Dict[int, Dict]:
+    """Group the sample columns by trial for plotting."""
     trial_data = {}
+    by_trial = {r["trial"]: r for r in results}
+    trial_ids = samples["trial"]
+    
+    for trial in np.unique(trial_ids).tolist():
+        mask = trial_ids == trial
+        vals = samples["boat_in_harbor"][mask].astype(int)
+        meta = by_trial.get(trial, {})
+        trial_data[trial] = {
+            "vals": vals,
+            "expected": meta.get("expected", "Unknown"),
+            "description": meta.get("description", ""),
+            "confidence": float(samples["confidence"][mask][0])
+        }
+    return trial_data
+
+
+def _draw_timeline(ax, trial_data: Dict[int, Dict], trials: List[int], colors: np.ndarray,
+                   label_fn, xlabel: str, title: str) -> None:
+    """Step plot of detected location per trial, laid end to end with dotted trial boundaries.
     
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "confidence": sample.get("confidence", 0.0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_in_harbor") else 0)
+    All trials go into one LineCollection and one vlines call rather than a step() and two
+    axvline() artists per trial; the legend uses lightweight proxy handles.
+    """
+    segments, seg_colors, bounds, bound_colors, handles = [], [], [], [], []
+    sample_idx = 0
+    
+    for i, trial in enumerate(trials):
+        data = trial_data.get(trial)
+        if data is None or not data["vals"].size:
+            continue
+        n = len(data["vals"])
+        # where="post" step path: hold each value until the next sample index
+        xs = np.repeat(np.arange(sample_idx, sample_idx + n), 2)[1:]
+        ys = np.repeat(data["vals"], 2)[:-1]
+        segments.append(np.column_stack((xs, ys)))
+        seg_colors.append(colors[i])
+        bounds.extend((sample_idx, sample_idx + n - 1))
+        bound_colors.extend((colors[i], colors[i]))
+        handles.append(Line2D([], [], color=colors[i], linewidth=2, label=label_fn(trial, data)))
+        sample_idx += n
+    
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=seg_colors, linewidths=2))
+        ax.autoscale_view()
+        # Add trial boundaries (full axes height, like axvline)
+        ax.vlines(bounds, 0, 1, colors=bound_colors, linestyles=":", alpha=0.7,
+                  transform=ax.get_xaxis_transform())
+    
+    ax.set_yticks([0, 1])
+    ax.set_yticklabels(["On Water", "In Shed"])
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Detected Location")
+    ax.set_title(title)
+    ax.grid(True, alpha=0.3)
+    ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+
+
+def _draw_accuracy_bar(ax, trials: List[int], accuracy: np.ndarray, title: str) -> None:
+    """Pass/fail bar per trial with the value printed above each bar."""
+    x_pos = np.arange(len(trials))
+    colors_bar = np.where(accuracy > 0, 'green', 'red')
+    
+    ax.bar(x_pos, accuracy, color=colors_bar, alpha=0.7, edgecolor='black')
+    ax.set_xlabel("Trial Number")
+    ax.set_ylabel("Accuracy (1=Pass, 0=Fail)")
+    ax.set_title(title)
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels([f"T{t}" for t in trials])
+    ax.set_ylim(-0.1, 1.1)
+    ax.grid(True, alpha=0.3)
+    
+    # Add value labels on bars
+    for i, acc in enumerate(accuracy.tolist()):
+        ax.text(i, acc + 0.05, f"{acc:.0f}", ha='center', va='bottom', fontweight='bold')
+
+
+def create_professional_plot(trial_data: Dict[int, Dict], boat_id: str, out_dir: str, results: List[Dict],
+                             colors: np.ndarray, fig: plt.Figure, dpi: int = 300) -> None:
+    """Create professional plot suitable for official documentation (drawn on, then cleared from, fig)."""
 
     if not trial_data:
         print("No data to plot")
         return
 
     # Create comprehensive professional plot
-    fig = plt.figure(figsize=(16, 12))
+    fig.set_size_inches(16, 12)
     gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Timeline with trial separation (top, spans 2 columns)
     ax1 = fig.add_subplot(gs[0, :])
-    colors = plt.cm.tab10(np.linspace(0, 1, len(trial_data)))
-    sample_idx = 0
-    
-    for i, (trial, data) in enumerate(sorted(trial_data.items())):
-        if data["times"]:
-            # Create time series for this trial
-            trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-            ax1.step(trial_times, data["vals"], where="post", 
-                    color=colors[i], label=f"Trial {trial}: {data['expected']}", linewidth=2)
-            # Add trial boundaries
-            ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-            ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-            sample_idx += len(data["vals"])
-    
-    ax1.set_yticks([0, 1])
-    ax1.set_yticklabels(["On Water", "In Shed"])
-    ax1.set_xlabel("Sample Index (5-second intervals)")
-    ax1.set_ylabel("Detected Location")
-    ax1.set_title(f"T1 Location Detection Test - Boat {boat_id}\nTimeline by Trial with Expected vs Observed States")
-    ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    _draw_timeline(ax1, trial_data, sorted(trial_data), colors,
+                   lambda trial, data: f"Trial {trial}: {data['expected']}",
+                   "Sample Index (5-second intervals)",
+                   f"T1 Location Detection Test - Boat {boat_id}\nTimeline by Trial with Expected vs Observed States")
     
     # Plot 2: Accuracy summary (middle left)
     ax2 = fig.add_subplot(gs[1, 0])
-    trials = sorted(trial_data.keys())
-    accuracy_per_trial = []
-    colors_bar = []
-    
-    for trial in trials:
-        data = trial_data[trial]
-        if not data["vals"]:
-            continue
-            
-        # Majority vote for observed
-        observed = 1 if sum(data["vals"]) >= len(data["vals"])/2 else 0
-        
-        # Expected based on trial data
-        expected_str = data["expected"].lower().replace(" ", "")
-        expected = 1 if expected_str == "inshed" else 0
-        
-        # Calculate accuracy for this trial
-        accuracy = 1.0 if observed == expected else 0.0
-        accuracy_per_trial.append(accuracy)
-        colors_bar.append('green' if accuracy > 0 else 'red')
+    trials = [t for t in sorted(trial_data) if trial_data[t]["vals"].size]
     
-    x_pos = np.arange(len(trials))
-    bars = ax2.bar(x_pos, accuracy_per_trial, color=colors_bar, alpha=0.7, edgecolor='black')
-    ax2.set_xlabel("Trial Number")
-    ax2.set_ylabel("Accuracy (1=Pass, 0=Fail)")
-    ax2.set_title(f"Trial-by-Trial Results\nOverall Accuracy: {sum(accuracy_per_trial)/len(accuracy_per_trial)*100:.1f}%")
-    ax2.set_xticks(x_pos)
-    ax2.set_xticklabels([f"T{t}" for t in trials])
-    ax2.set_ylim(-0.1, 1.1)
-    ax2.grid(True, alpha=0.3)
+    # Majority vote for observed, one reduceat over all trials' samples laid end to end
+    sizes = np.array([trial_data[t]["vals"].size for t in trials])
+    in_shed_counts = np.add.reduceat(np.concatenate([trial_data[t]["vals"] for t in trials]),
+                                     np.concatenate(([0], np.cumsum(sizes)[:-1])))
+    observed = in_shed_counts >= sizes / 2
+    expected = np.array([trial_data[t]["expected"] == "In Shed" for t in trials])
+    accuracy_per_trial = (observed == expected).astype(float)
     
-    # Add value labels on bars
-    for i, (bar, acc) in enumerate(zip(bars, accuracy_per_trial)):
-        ax2.text(bar.get_x() + bar.get_width()/2., acc + 0.05, 
-                f"{acc:.0f}", ha='center', va='bottom', fontweight='bold')
+    _draw_accuracy_bar(ax2, trials, accuracy_per_trial,
+                       f"Trial-by-Trial Results\nOverall Accuracy: {accuracy_per_trial.mean()*100:.1f}%")
     
     # Plot 3: Confidence distribution (middle right)
     ax3 = fig.add_subplot(gs[1, 1])
-    confidences = [data["confidence"] for data in trial_data.values()]
-    colors_conf = ['green' if conf > 0.7 else 'orange' if conf > 0.5 else 'red' for conf in confidences]
+    x_pos = np.arange(len(trials))
+    confidences = np.array([trial_data[t]["confidence"] for t in trials])
+    colors_conf = np.where(confidences > 0.7, 'green', np.where(confidences > 0.5, 'orange', 'red'))
     
     bars_conf = ax3.bar(x_pos, confidences, color=colors_conf, alpha=0.7, edgecolor='black')
     ax3.set_xlabel("Trial Number")
@@ -341,14 +375,14 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     max_confidence = np.max(confidences)
     
     # Create comprehensive summary text
-    summary_text = f"""T1 Location Detection Test - Comprehensive Results Summary
+    header = f"""T1 Location Detection Test - Comprehensive Results Summary
 {'='*80}
 
 TEST CONFIGURATION:
 • Boat ID: {boat_id}
 • Test Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 • Total Trials: {total_trials}
-• Test Duration: {sum(len(samples) for samples in [trial_data[t] for t in trials]) * 5 / 60:.1f} minutes
+• Test Duration: {int(sizes.sum()) * 5 / 60:.1f} minutes
 
 PERFORMANCE METRICS:
 • Passed Trials: {passed_trials}
@@ -364,279 +398,193 @@ ACCEPTANCE CRITERIA EVALUATION:
 
 TRIAL BREAKDOWN:"""
     
-    for i, result in enumerate(results, 1):
-        status_icon = "PASS" if result["pass_fail"] == "Pass" else "FAIL"
-        summary_text += f"\n• Trial {i}: {result['expected']} → {result['observed']} {status_icon} ({result['pass_fail']})"
+    breakdown = [
+        f"• Trial {i}: {r['expected']} → {r['observed']} {'PASS' if r['pass_fail'] == 'Pass' else 'FAIL'} ({r['pass_fail']})"
+        for i, r in enumerate(results, 1)
+    ]
+    issues = [r['comments_defects'] for r in results if r['comments_defects']]
     
-    summary_text += f"""
-
+    footer = f"""
 ISSUES NOTED:
-{', '.join([r['comments_defects'] for r in results if r['comments_defects']]) if any(r['comments_defects'] for r in results) else 'No significant issues detected'}
+{', '.join(issues) if issues else 'No significant issues detected'}
 
 RECOMMENDATIONS:
 • System performance {'meets' if accuracy >= 0.95 else 'does not meet'} acceptance criteria
 • {'Continue monitoring for edge cases' if accuracy >= 0.95 else 'Investigate detection algorithm and calibration parameters'}"""
     
+    summary_text = "\n".join([header, *breakdown, footer])
+    
     ax4.text(0.02, 0.98, summary_text, transform=ax4.transAxes, fontsize=10,
             verticalalignment='top', fontfamily='monospace',
             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightblue", alpha=0.8))
     
-    plt.suptitle("Digital Boat Tracking Board - T1 Location Detection Test Results", 
+    fig.suptitle("Digital Boat Tracking Board - T1 Location Detection Test Results", 
                 fontsize=16, fontweight='bold')
     
     plot_path = os.path.join(out_dir, "T1_Location_Detection_Results.png")
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(plot_path, dpi=dpi, bbox_inches='tight')
+    fig.clear()
     print(f"Professional plot saved to: {plot_path}")
 
 
-def create_split_plots(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
-    """Create separate plots for In->Out and Out->In crossings for better visibility."""
-    
-    # Separate trials into in->out and out->in crossings
-    in_to_out_results = [r for r in results if r["expected"] == "On Water"]
-    out_to_in_results = [r for r in results if r["expected"] == "In Shed"]
-    
-    # Parse data with trial information
-    trial_data = {}
+def _plot_crossings(trial_data: Dict[int, Dict], crossing_results: List[Dict], boat_id: str, colors: np.ndarray,
+                    name: str, heading: str, facecolor: str, plot_path: str, fig: plt.Figure, dpi: int = 300) -> None:
+    """Timeline, accuracy bars and summary for one crossing direction."""
+    fig.set_size_inches(16, 10)
+    gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "confidence": sample.get("confidence", 0.0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_in_harbor") else 0)
-
-    if not trial_data:
-        print("No data to plot")
-        return
-
-    # Create In->Out crossings plot
-    fig1 = plt.figure(figsize=(16, 10))
-    gs1 = fig1.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    # Plot 1: Timeline
+    ax1 = fig.add_subplot(gs[0, :])
+    crossing_trials = [r["trial"] for r in crossing_results]
+    _draw_timeline(ax1, trial_data, crossing_trials, colors,
+                   lambda trial, data: f"Trial {trial}", "Sample Index",
+                   f"{name} Crossings ({len(crossing_trials)} trials) - Boat {boat_id}")
     
-    # Plot 1: In->Out Timeline
-    ax1 = fig1.add_subplot(gs1[0, :])
-    in_to_out_trials = [r["trial"] for r in in_to_out_results]
-    colors = plt.cm.tab10(np.linspace(0, 1, len(in_to_out_trials)))
-    sample_idx = 0
+    # Plot 2: Accuracy
+    ax2 = fig.add_subplot(gs[1, 0])
+    accuracy = np.array([r["pass_fail"] == "Pass" for r in crossing_results], dtype=float)
+    _draw_accuracy_bar(ax2, crossing_trials, accuracy,
+                       f"{name} Accuracy: {accuracy.mean()*100:.1f}%")
     
-    for i, trial in enumerate(in_to_out_trials):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial}", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
-    
-    ax1.set_yticks([0, 1])
-    ax1.set_yticklabels(["On Water", "In Shed"])
-    ax1.set_xlabel("Sample Index")
-    ax1.set_ylabel("Detected Location")
-    ax1.set_title(f"In->Out Crossings ({len(in_to_out_trials)} trials) - Boat {boat_id}")
-    ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
-    
-    # Plot 2: In->Out Accuracy
-    ax2 = fig1.add_subplot(gs1[1, 0])
-    in_to_out_accuracy = [1.0 if r["pass_fail"] == "Pass" else 0.0 for r in in_to_out_results]
-    
-    x_pos = np.arange(len(in_to_out_results))
-    colors_bar = ['green' if acc > 0 else 'red' for acc in in_to_out_accuracy]
-    
-    bars = ax2.bar(x_pos, in_to_out_accuracy, color=colors_bar, alpha=0.7, edgecolor='black')
-    ax2.set_xlabel("Trial Number")
-    ax2.set_ylabel("Accuracy (1=Pass, 0=Fail)")
-    ax2.set_title(f"In->Out Accuracy: {sum(in_to_out_accuracy)/len(in_to_out_accuracy)*100:.1f}%")
-    ax2.set_xticks(x_pos)
-    ax2.set_xticklabels([f"T{r['trial']}" for r in in_to_out_results])
-    ax2.set_ylim(-0.1, 1.1)
-    ax2.grid(True, alpha=0.3)
-    
-    for i, acc in enumerate(in_to_out_accuracy):
-        ax2.text(i, acc + 0.05, f"{acc:.0f}", ha='center', va='bottom', fontweight='bold')
-    
-    # Plot 3: In->Out Summary
-    ax3 = fig1.add_subplot(gs1[1, 1])
+    # Plot 3: Summary
+    ax3 = fig.add_subplot(gs[1, 1])
     ax3.axis('off')
     
-    in_to_out_passed = sum(1 for r in in_to_out_results if r["pass_fail"] == "Pass")
-    summary_text = f"""In->Out Crossings Summary
+    passed = sum(1 for r in crossing_results if r["pass_fail"] == "Pass")
+    header = f"""{name} Crossings Summary
 {'='*40}
-Total Trials: {len(in_to_out_results)}
-Passed: {in_to_out_passed}
-Failed: {len(in_to_out_results) - in_to_out_passed}
-Accuracy: {in_to_out_passed/len(in_to_out_results)*100:.1f}%
+Total Trials: {len(crossing_results)}
+Passed: {passed}
+Failed: {len(crossing_results) - passed}
+Accuracy: {passed/len(crossing_results)*100:.1f}%
 
 Trial Details:"""
-    
-    for r in in_to_out_results:
-        status_icon = "PASS" if r["pass_fail"] == "Pass" else "FAIL"
-        summary_text += f"\n• Trial {r['trial']}: {status_icon} ({r['pass_fail']})"
+    details = [
+        f"• Trial {r['trial']}: {'PASS' if r['pass_fail'] == 'Pass' else 'FAIL'} ({r['pass_fail']})"
+        for r in crossing_results
+    ]
+    summary_text = "\n".join([header, *details])
     
     ax3.text(0.05, 0.95, summary_text, transform=ax3.transAxes, fontsize=10,
             verticalalignment='top', fontfamily='monospace',
-            bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8))
-    
-    plt.suptitle("T1 Test - In->Out Crossings (Shed to Water)", fontsize=16, fontweight='bold')
-    
-    plot_path1 = os.path.join(out_dir, "T1_In_to_Out_Crossings.png")
-    plt.savefig(plot_path1, dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"In->Out crossings plot saved to: {plot_path1}")
+            bbox=dict(boxstyle="round,pad=0.5", facecolor=facecolor, alpha=0.8))
     
-    # Create Out->In crossings plot
-    fig2 = plt.figure(figsize=(16, 10))
-    gs2 = fig2.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    fig.suptitle(heading, fontsize=16, fontweight='bold')
     
-    # Plot 1: Out->In Timeline
-    ax1 = fig2.add_subplot(gs2[0, :])
-    out_to_in_trials = [r["trial"] for r in out_to_in_results]
-    colors = plt.cm.tab10(np.linspace(0, 1, len(out_to_in_trials)))
-    sample_idx = 0
-    
-    for i, trial in enumerate(out_to_in_trials):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial}", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
-    
-    ax1.set_yticks([0, 1])
-    ax1.set_yticklabels(["On Water", "In Shed"])
-    ax1.set_xlabel("Sample Index")
-    ax1.set_ylabel("Detected Location")
-    ax1.set_title(f"Out->In Crossings ({len(out_to_in_trials)} trials) - Boat {boat_id}")
-    ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
-    
-    # Plot 2: Out->In Accuracy
-    ax2 = fig2.add_subplot(gs2[1, 0])
-    out_to_in_accuracy = [1.0 if r["pass_fail"] == "Pass" else 0.0 for r in out_to_in_results]
-    
-    x_pos = np.arange(len(out_to_in_results))
-    colors_bar = ['green' if acc > 0 else 'red' for acc in out_to_in_accuracy]
-    
-    bars = ax2.bar(x_pos, out_to_in_accuracy, color=colors_bar, alpha=0.7, edgecolor='black')
-    ax2.set_xlabel("Trial Number")
-    ax2.set_ylabel("Accuracy (1=Pass, 0=Fail)")
-    ax2.set_title(f"Out->In Accuracy: {sum(out_to_in_accuracy)/len(out_to_in_accuracy)*100:.1f}%")
-    ax2.set_xticks(x_pos)
-    ax2.set_xticklabels([f"T{r['trial']}" for r in out_to_in_results])
-    ax2.set_ylim(-0.1, 1.1)
-    ax2.grid(True, alpha=0.3)
-    
-    for i, acc in enumerate(out_to_in_accuracy):
-        ax2.text(i, acc + 0.05, f"{acc:.0f}", ha='center', va='bottom', fontweight='bold')
-    
-    # Plot 3: Out->In Summary
-    ax3 = fig2.add_subplot(gs2[1, 1])
-    ax3.axis('off')
-    
-    out_to_in_passed = sum(1 for r in out_to_in_results if r["pass_fail"] == "Pass")
-    summary_text = f"""Out->In Crossings Summary
-{'='*40}
-Total Trials: {len(out_to_in_results)}
-Passed: {out_to_in_passed}
-Failed: {len(out_to_in_results) - out_to_in_passed}
-Accuracy: {out_to_in_passed/len(out_to_in_results)*100:.1f}%
+    fig.savefig(plot_path, dpi=dpi, bbox_inches='tight')
+    fig.clear()
+    print(f"{name} crossings plot saved to: {plot_path}")
 
-Trial Details:"""
-    
-    for r in out_to_in_results:
-        status_icon = "PASS" if r["pass_fail"] == "Pass" else "FAIL"
-        summary_text += f"\n• Trial {r['trial']}: {status_icon} ({r['pass_fail']})"
-    
-    ax3.text(0.05, 0.95, summary_text, transform=ax3.transAxes, fontsize=10,
-            verticalalignment='top', fontfamily='monospace',
-            bbox=dict(boxstyle="round,pad=0.5", facecolor="lightblue", alpha=0.8))
-    
-    plt.suptitle("T1 Test - Out->In Crossings (Water to Shed)", fontsize=16, fontweight='bold')
+
+def create_split_plots(trial_data: Dict[int, Dict], boat_id: str, out_dir: str, results: List[Dict],
+                       colors: np.ndarray, fig: plt.Figure, dpi: int = 300) -> None:
+    """Create separate plots for In->Out and Out->In crossings for better visibility."""
     
-    plot_path2 = os.path.join(out_dir, "T1_Out_to_In_Crossings.png")
-    plt.savefig(plot_path2, dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"Out->In crossings plot saved to: {plot_path2}")
+    # Separate trials into in->out and out->in crossings
+    in_to_out_results = [r for r in results if r["expected"] == "On Water"]
+    out_to_in_results = [r for r in results if r["expected"] == "In Shed"]
+
+    if not trial_data:
+        print("No data to plot")
+        return
+
+    _plot_crossings(trial_data, in_to_out_results, boat_id, colors,
+                    "In->Out", "T1 Test - In->Out Crossings (Shed to Water)", "lightgreen",
+                    os.path.join(out_dir, "T1_In_to_Out_Crossings.png"), fig, dpi)
+    _plot_crossings(trial_data, out_to_in_results, boat_id, colors,
+                    "Out->In", "T1 Test - Out->In Crossings (Water to Shed)", "lightblue",
+                    os.path.join(out_dir, "T1_Out_to_In_Crossings.png"), fig, dpi)
 
 
 def save_official_csv(results: List[Dict], out_dir: str):
     """Save results in official T1 format."""
     csv_path = os.path.join(out_dir, "T1_Official_Results.csv")
     
-    with open(csv_path, 'w', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Header matching official format
-        writer.writerow(["Digital Boat Tracking Board – Result Sheet R1"])
-        writer.writerow(["Result Sheet – Location Detection"])
-        writer.writerow(["Test ID: T1"])
-        writer.writerow(["Requirement: R1"])
-        writer.writerow(["Requirement Statement: The system shall automatically detect the location of each boat and classify it as either 'In Shed' or 'On Water'."])
-        writer.writerow([f"Date: {datetime.now().strftime('%d/%m/%Y')}"])
-        writer.writerow(["Tester: Automated Test System"])
-        writer.writerow(["Observer: System Monitor"])
-        writer.writerow(["Environment: Controlled Test Environment"])
-        writer.writerow(["System Version / Config: v1.0 - Door-LR Logic"])
-        writer.writerow([])
-        writer.writerow(["Results Table"])
-        writer.writerow(["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"])
-        
-        # Data rows
-        for result in results:
-            writer.writerow([
-                result["trial"],
-                result["expected"],
-                result["observed"],
-                result["dashboard_log_status"],
-                result["time"],
-                result["pass_fail"],
-                result["comments_defects"]
-            ])
-        
-        # Summary
-        total_trials = len(results)
-        passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
-        failed_trials = total_trials - passed_trials
-        accuracy = passed_trials / total_trials if total_trials > 0 else 0
-        
-        writer.writerow([])
-        writer.writerow(["Summary"])
-        writer.writerow([f"Total Trials: {total_trials}"])
-        writer.writerow([f"Passes: {passed_trials}"])
-        writer.writerow([f"Fails: {failed_trials}"])
-        writer.writerow([f"Accuracy (%): {accuracy:.1f}%"])
-        writer.writerow([])
-        writer.writerow(["Acceptance Criteria: ≥95% correct classifications across all crossings"])
-        writer.writerow([f"Result: {'Pass' if accuracy >= 0.95 else 'Fail'}"])
-        
-        issues = [r['comments_defects'] for r in results if r['comments_defects']]
-        writer.writerow([f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"])
-        writer.writerow([])
-        writer.writerow(["Attachments: Screenshots, Logs, CSV Exports"])
+    # Summary
+    total_trials = len(results)
+    passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
+    failed_trials = total_trials - passed_trials
+    accuracy = passed_trials / total_trials if total_trials > 0 else 0
+    issues = [r['comments_defects'] for r in results if r['comments_defects']]
+    
+    # Header matching official format
+    rows = [
+        ["Digital Boat Tracking Board – Result Sheet R1"],
+        ["Result Sheet – Location Detection"],
+        ["Test ID: T1"],
+        ["Requirement: R1"],
+        ["Requirement Statement: The system shall automatically detect the location of each boat and classify it as either 'In Shed' or 'On Water'."],
+        [f"Date: {datetime.now().strftime('%d/%m/%Y')}"],
+        ["Tester: Automated Test System"],
+        ["Observer: System Monitor"],
+        ["Environment: Controlled Test Environment"],
+        ["System Version / Config: v1.0 - Door-LR Logic"],
+        [],
+        ["Results Table"],
+        ["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"]
+    ]
+    
+    # Data rows
+    rows.extend(
+        [r["trial"], r["expected"], r["observed"], r["dashboard_log_status"], r["time"], r["pass_fail"], r["comments_defects"]]
+        for r in results
+    )
+    
+    rows.extend([
+        [],
+        ["Summary"],
+        [f"Total Trials: {total_trials}"],
+        [f"Passes: {passed_trials}"],
+        [f"Fails: {failed_trials}"],
+        [f"Accuracy (%): {accuracy:.1f}%"],
+        [],
+        ["Acceptance Criteria: ≥95% correct classifications across all crossings"],
+        [f"Result: {'Pass' if accuracy >= 0.95 else 'Fail'}"],
+        [f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"],
+        [],
+        ["Attachments: Screenshots, Logs, CSV Exports"]
+    ])
+    
+    with open(csv_path, 'w', newline='', buffering=1 << 20) as f:
+        csv.writer(f).writerows(rows)
     
     print(f"Official CSV saved to: {csv_path}")
 
 
-def save_detailed_log(samples: List[Dict], out_dir: str):
-    """Save detailed log data."""
+def save_detailed_log(samples: Dict[str, np.ndarray], results: List[Dict], out_dir: str):
+    """Save detailed log data (one JSON object per sample)."""
     jsonl_path = os.path.join(out_dir, "T1_Detailed_Log.jsonl")
-    with open(jsonl_path, 'w') as f:
-        for sample in samples:
-            f.write(json.dumps(sample) + '\n')
+    by_trial = {r["trial"]: r for r in results}
+    columns = zip(
+        np.datetime_as_string(samples["timestamp"]).tolist(),
+        samples["trial"].tolist(),
+        samples["sample_idx"].tolist(),
+        samples["boat_in_harbor"].tolist(),
+        samples["confidence"].tolist(),
+        samples["rssi"].tolist(),
+        SCANNER_IDS[samples["scanner_id"]].tolist()
+    )
+    lines = []
+    with open(jsonl_path, 'w', buffering=1 << 20) as f:
+        for ts, trial, idx, in_harbor, conf, rssi, scanner in columns:
+            sample = {
+                "timestamp": ts,
+                "trial": trial,
+                "expected": by_trial[trial]["expected"],
+                "description": by_trial[trial]["description"],
+                "sample_idx": idx,
+                "boat_in_harbor": in_harbor,
+                "confidence": conf,
+                "rssi": rssi,
+                "scanner_id": scanner
+            }
+            lines.append(json.dumps(sample, separators=(',', ':')))
+            # Write in chunks to bound peak memory on long runs
+            if len(lines) >= JSONL_CHUNK_LINES:
+                f.write('\n'.join(lines) + '\n')
+                lines.clear()
+        if lines:
+            f.write('\n'.join(lines) + '\n')
     print(f"Detailed log saved to: {jsonl_path}")
 
 
@@ -645,8 +593,11 @@ def main():
     parser.add_argument("--boat-id", default="RC-001", help="Boat ID to test")
     parser.add_argument("--trials", type=int, default=10, help="Number of trials (default: 10)")
     parser.add_argument("--output-dir", default="results/T1", help="Output directory")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for reproducible runs (default: random)")
+    parser.add_argument("--dpi", type=int, default=300, help="Plot resolution (default: 300; 150 is plenty for CI runs)")
     
     args = parser.parse_args()
+    seed = args.seed if args.seed is not None else int.from_bytes(os.urandom(4), 'big')
     
     # Create output directory
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -656,27 +607,42 @@ def main():
     print(f"Official T1 Demo for boat {args.boat_id}")
     print(f"Generating {args.trials} trials with realistic scenarios...")
     print(f"Output directory: {out_dir}")
+    print(f"Seed: {seed}")
     
     # Generate scenarios
     scenarios = generate_realistic_scenarios()
     
     # Generate trial data
     results = []
-    all_samples = []
+    trial_samples = []
     
     for trial_num in range(1, args.trials + 1):
         scenario = scenarios[(trial_num - 1) % len(scenarios)]
-        trial_result, samples = generate_trial_data(scenario, trial_num, args.boat_id)
+        trial_result, samples = generate_trial_data(scenario, trial_num, args.boat_id, seed)
         results.append(trial_result)
-        all_samples.extend(samples)
+        trial_samples.append(samples)
         
         print(f"Trial {trial_num}: {scenario['description']} - {trial_result['pass_fail']}")
     
+    # Concatenate per-trial columns once (empty typed columns for a zero-trial run)
+    if trial_samples:
+        all_samples = {col: np.concatenate([s[col] for s in trial_samples]) for col in SAMPLE_COLUMNS}
+    else:
+        all_samples = {col: np.empty(0, dtype=dtype) for col, dtype in SAMPLE_COLUMNS.items()}
+    
     # Save results
     save_official_csv(results, out_dir)
-    save_detailed_log(all_samples, out_dir)
-    create_professional_plot(all_samples, args.boat_id, out_dir, results)
-    create_split_plots(all_samples, args.boat_id, out_dir, results)
+    save_detailed_log(all_samples, results, out_dir)
+    
+    # One palette shared by every timeline (sized for the longest one)
+    colors = plt.cm.tab10(np.linspace(0, 1, max(len(results), 1)))
+    trial_data = build_trial_data(all_samples, results)
+    
+    # One Figure reused for all three outputs (cleared after each savefig)
+    fig = plt.figure(figsize=(16, 12))
+    create_professional_plot(trial_data, args.boat_id, out_dir, results, colors, fig, args.dpi)
+    create_split_plots(trial_data, args.boat_id, out_dir, results, colors, fig, args.dpi)
+    plt.close(fig)
     
     # Print summary
     total_trials = len(results)
@@ -10,17 +10,58 @@ import json
 import os
 import sys
 import time
-import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Tuple
 
 try:
+    import matplotlib
+    matplotlib.use("Agg")  # headless: figures are only ever saved to disk
     import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import ListedColormap
+    from matplotlib.lines import Line2D
     import numpy as np
 except Exception as e:
     print("ERROR: matplotlib and numpy required. Try: pip install matplotlib numpy", file=sys.stderr)
     raise
 
+try:
+    import orjson
+except ImportError:  # optional: the detailed log falls back to the stdlib encoder
+    orjson = None
+
+
+SCANNER_IDS = np.array(["gate-inner", "gate-outer"])
+
+# Colour tables sampled once at import, sized for the default 20-trial run
+PALETTE_SIZE = 20
+_TAB10 = plt.cm.tab10(np.linspace(0, 1, PALETTE_SIZE))
+_GREENS = plt.cm.Greens(np.linspace(0.3, 0.9, PALETTE_SIZE))
+_ORANGES = plt.cm.Oranges(np.linspace(0.3, 0.9, PALETTE_SIZE))
+
+# Fast zlib level for the PNGs; files are a little larger but encode several times quicker
+PNG_SAVE_KWARGS = {"optimize": False, "compress_level": 1}
+
+# savefig options per --format; SVG is written as vector paths, WebP uses Pillow's fastest method
+PLOT_SAVE_KWARGS = {
+    "png": {"pil_kwargs": PNG_SAVE_KWARGS},
+    "svg": {},
+    "webp": {"pil_kwargs": {"method": 0, "quality": 85}}
+}
+
+# One row per sample; expected/description live on the trial result, not on every row
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "datetime64[us]"),
+    ("trial", np.int32),
+    ("sample_idx", np.int32),
+    ("boat_in_harbor", np.bool_),
+    ("latency_seconds", np.float64),
+    ("rssi", np.float64),
+    ("scanner_id", np.uint8),
+    ("response_time_ms", np.float64),
+])
+
 
 def iso_now() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -124,20 +165,28 @@ def generate_realistic_scenarios() -> List[Dict]:
     return scenarios
 
 
-def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[Dict, List[Dict]]:
-    """Generate realistic trial data for T2 real-time update testing."""
+def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str,
+                        run_timestamp: str) -> Tuple[Dict, np.ndarray, np.ndarray]:
+    """Generate realistic trial data for T2 real-time update testing.
+    
+    run_timestamp is the ISO-8601 UTC run time, formatted once in main() and stamped on every trial.
+    Samples come back as a SAMPLE_DTYPE structured array, one row per 5 s sample, alongside the
+    detected states as an int8 array (1 = In Shed) that the plots use directly.
+    """
+    
+    rng = np.random.default_rng()
     
     # Determine if this trial passes based on success rate
-    passes = random.random() < scenario["success_rate"]
+    passes = rng.random() < scenario["success_rate"]
     
     # Generate realistic latency
     if passes:
         # Within SLA (≤5 seconds for 95% compliance)
-        latency = random.uniform(*scenario["latency_range"])
+        latency = rng.uniform(*scenario["latency_range"])
         observed = scenario["expected"]
     else:
         # Exceeds SLA but within maximum threshold (≤7s max)
-        latency = random.uniform(5.1, 7.0)  # Exceeds 5s SLA but within 7s max
+        latency = rng.uniform(5.1, 7.0)  # Exceeds 5s SLA but within 7s max
         # Generate realistic failure mode
         if scenario["expected"] == "In Shed":
             observed = "On Water"  # Delayed detection
@@ -145,8 +194,9 @@ def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[D
             observed = "In Shed"   # Delayed detection
     
     # Generate realistic timing
-    start_time = datetime.now() - timedelta(minutes=scenario["duration_minutes"])
-    end_time = datetime.now()
+    now = datetime.now()  # single clock read per trial
+    start_time = now - timedelta(minutes=scenario["duration_minutes"])
+    end_time = now
     
     # Generate dashboard/log status
     if passes:
@@ -172,99 +222,175 @@ def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[D
         "latency_seconds": latency,
         "comments_defects": "" if passes else f"Update latency {latency:.1f}s exceeds 5s SLA (within 7s max) in {scenario['description']}",
         "description": scenario["description"],
-        "timestamp": iso_now()
+        "timestamp": run_timestamp
     }
     
-    # Generate sample data for this trial (simulating real-time monitoring)
-    samples = []
-    samples_per_trial = scenario["duration_minutes"] * 12  # 12 samples per minute (5s intervals)
+    # Generate sample data for this trial (simulating real-time monitoring), whole trial in one batch
+    n = scenario["duration_minutes"] * 12  # 12 samples per minute (5s intervals)
     
     base_state = 1 if scenario["expected"] == "In Shed" else 0
     
-    for sample_idx in range(samples_per_trial):
-        # Simulate the state change happening partway through the trial
-        change_point = samples_per_trial // 3  # State changes 1/3 through trial
-        
-        if sample_idx < change_point:
-            # Before state change
-            sample_state = 1 - base_state  # Opposite of expected (old state)
-        else:
-            # After state change
-            sample_state = base_state  # Expected state
-            
-            # Add some realistic delay in detection
-            if sample_idx < change_point + 3:  # First few samples after change might be delayed
-                if random.random() < 0.3:  # 30% chance of delayed detection
-                    sample_state = 1 - base_state
-        
-        # Add realistic timing variation
-        sample_time = start_time + timedelta(seconds=sample_idx * 5)
-        
-        sample = {
-            "timestamp": sample_time.isoformat(),
-            "trial": trial_num,
-            "expected": scenario["expected"],
-            "description": scenario["description"],
-            "sample_idx": sample_idx,
-            "boat_in_harbor": sample_state == 1,
-            "latency_seconds": latency,
-            "rssi": random.uniform(-45, -75) if sample_state == 1 else random.uniform(-60, -85),
-            "scanner_id": random.choice(["gate-inner", "gate-outer"]),
-            "response_time_ms": random.uniform(50, 200)  # API response time
-        }
-        samples.append(sample)
+    # Simulate the state change happening partway through the trial
+    change_point = n // 3  # State changes 1/3 through trial
+    sample_idx = np.arange(n)
+    states = np.empty(n, dtype=np.int8)
+    states[:change_point] = 1 - base_state
+    states[change_point:] = base_state
+    
+    # Add some realistic delay in detection: first few samples after the change have a 30% chance to lag
+    delayed = states[change_point:change_point + 3]
+    delayed[rng.random(delayed.size) < 0.3] = 1 - base_state
+    
+    rssi = np.where(states == 1, rng.uniform(-75, -45, n), rng.uniform(-85, -60, n))
+    
+    samples = np.empty(n, dtype=SAMPLE_DTYPE)
+    samples["timestamp"] = np.datetime64(start_time, "us") + sample_idx * np.timedelta64(5, "s")
+    samples["trial"] = trial_num
+    samples["sample_idx"] = sample_idx
+    samples["boat_in_harbor"] = states == 1
+    samples["latency_seconds"] = latency
+    samples["rssi"] = rssi
+    samples["scanner_id"] = rng.integers(0, len(SCANNER_IDS), size=n)
+    samples["response_time_ms"] = rng.uniform(50, 200, n)  # API response time
+    
+    return trial_result, samples, states
+
+
+def _palette(table: np.ndarray, k: int) -> np.ndarray:
+    """k colours spread evenly over a precomputed table (resampled from its colormap if k is larger)."""
+    if k > len(table):
+        return ListedColormap(table)(np.linspace(0, 1, k))
+    return table[np.linspace(0, len(table) - 1, k).round().astype(int)]
+
+
+def _m4_downsample(xs: np.ndarray, ys: np.ndarray, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """M4 aggregation: keep the first, last, min and max vertex of each x bucket.
+    
+    For a polyline drawn n_buckets pixels wide this renders identically to the full series,
+    so step boundaries are preserved exactly. xs must be non-decreasing.
+    """
+    if n_buckets < 1 or len(xs) <= 4 * n_buckets:
+        return xs, ys
+    edges = np.linspace(xs[0], xs[-1], n_buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, xs, side="right") - 1, 0, n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(xs)] - 1
+    idx = np.arange(len(xs))
+    seg = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(xs)]))
+    lo = np.minimum.reduceat(ys, starts)
+    hi = np.maximum.reduceat(ys, starts)
+    first_lo = np.minimum.reduceat(np.where(ys == lo[seg], idx, len(xs)), starts)
+    first_hi = np.minimum.reduceat(np.where(ys == hi[seg], idx, len(xs)), starts)
+    keep = np.unique(np.concatenate((starts, ends, first_lo, first_hi)))
+    return xs[keep], ys[keep]
+
+
+def _draw_timeline(ax, trial_data: Dict[int, Dict], trials: List[int], colors: np.ndarray, label_fn,
+                   dpi: int) -> List[Line2D]:
+    """Draw per-trial step series end to end as one LineCollection plus one vlines call.
+    
+    Series longer than the axes is wide (in output pixels at dpi) are M4-downsampled first.
+    Returns proxy legend handles, one per drawn trial.
+    """
+    segments, seg_colors, bounds, bound_colors, handles = [], [], [], [], []
+    sample_idx = 0
     
-    return trial_result, samples
+    for i, trial in enumerate(trials):
+        data = trial_data.get(trial)
+        if data is None or not data["vals"].size:
+            continue
+        n = len(data["vals"])
+        # where="post" step path: hold each value until the next sample index
+        xs = np.repeat(np.arange(sample_idx, sample_idx + n), 2)[1:]
+        ys = np.repeat(data["vals"], 2)[:-1]
+        segments.append(np.column_stack((xs, ys)))
+        seg_colors.append(colors[i])
+        bounds.extend((sample_idx, sample_idx + n - 1))
+        bound_colors.extend((colors[i], colors[i]))
+        handles.append(Line2D([], [], color=colors[i], linewidth=2, label=label_fn(trial, data)))
+        sample_idx += n
+    
+    if segments:
+        # Pixel columns available to each trial's share of the x range
+        width_px = ax.bbox.width * dpi / ax.figure.dpi
+        for k, seg in enumerate(segments):
+            n_buckets = max(1, int(width_px * (seg[-1, 0] - seg[0, 0] + 1) / sample_idx))
+            xs, ys = _m4_downsample(seg[:, 0], seg[:, 1], n_buckets)
+            segments[k] = np.column_stack((xs, ys))
+        # rasterized only matters for --format svg: the dense paths go in as one bitmap, text stays vector
+        ax.add_collection(LineCollection(segments, colors=seg_colors, linewidths=2, rasterized=True))
+        ax.autoscale_view()
+        # Trial boundaries span the full axes height, like axvline
+        ax.vlines(bounds, 0, 1, colors=bound_colors, linestyles=":", alpha=0.7,
+                  transform=ax.get_xaxis_transform(), rasterized=True)
+    return handles
+
+
+def trial_entry(vals: np.ndarray, result: Dict) -> Dict:
+    """Plot inputs for one trial: its int8 state array plus the result fields the legends use."""
+    return {
+        "vals": vals,
+        "expected": result["expected"],
+        "description": result["description"],
+        "latency": float(result["latency_seconds"])
+    }
 
 
-def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
-    """Create professional T2 plot focusing on real-time update performance."""
+def sample_latencies(trial_data: Dict[int, Dict]) -> np.ndarray:
+    """Per-sample update latencies for the distribution plot (every sample in a trial shares its latency)."""
+    lats = np.array([data["latency"] for data in trial_data.values()], dtype=np.float64)
+    counts = np.array([data["vals"].size for data in trial_data.values()], dtype=np.int64)
+    latencies = np.repeat(lats, counts)
+    return latencies[latencies != 0]
+
+
+def trial_stats(results: List[Dict]) -> Dict[str, Any]:
+    """Pass counts and latency statistics, computed once for the summary file, the CSV and the console report."""
+    total = len(results)
+    passed = sum(1 for r in results if r["pass_fail"] == "Pass")
+    accuracy = passed / total if total > 0 else 0
+    stats = {
+        "total": total,
+        "passed": passed,
+        "failed": total - passed,
+        "accuracy": accuracy,
+        "accuracy_pct": f"{accuracy:.1%}"
+    }
     
-    # Parse data with trial information
-    trial_data = {}
-    latencies = []
-    
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "latency": sample.get("latency_seconds", 0.0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_in_harbor") else 0)
-        
-        # Collect latencies
-        if sample.get("latency_seconds"):
-            latencies.append(sample.get("latency_seconds"))
+    lats = np.array([r["latency_seconds"] for r in results], dtype=np.float64)
+    if not lats.size:
+        stats.update(mean=0.0, min=0.0, max=0.0, p95=0.0, sla_compliant=0, sla_pct="0.0%")
+        return stats
+    sla_compliant = int(np.count_nonzero(lats <= 5.0))
+    stats.update(
+        mean=float(lats.mean()),
+        min=float(lats.min()),
+        max=float(lats.max()),
+        p95=float(np.percentile(lats, 95)),
+        sla_compliant=sla_compliant,
+        sla_pct=f"{sla_compliant / total:.1%}"
+    )
+    return stats
+
+
+def create_professional_plot(trial_data: Dict[int, Dict], latencies: np.ndarray, stats: Dict[str, Any],
+                             boat_id: str, out_dir: str, results: List[Dict],
+                             fig: plt.Figure, dpi: int = 150, fmt: str = "png") -> None:
+    """Create professional T2 plot focusing on real-time update performance (drawn on, then cleared from, fig)."""
 
     if not trial_data:
         print("No data to plot")
         return
 
     # Create comprehensive professional plot
-    fig = plt.figure(figsize=(16, 12))
-    gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
+    fig.set_size_inches(16, 9)
+    gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Timeline with state changes (top, spans 2 columns)
     ax1 = fig.add_subplot(gs[0, :])
-    colors = plt.cm.tab10(np.linspace(0, 1, len(trial_data)))
-    sample_idx = 0
-    
-    for i, (trial, data) in enumerate(sorted(trial_data.items())):
-        if data["times"]:
-            # Create time series for this trial
-            trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-            ax1.step(trial_times, data["vals"], where="post", 
-                    color=colors[i], label=f"Trial {trial}: {data['expected']}", linewidth=2)
-            # Add trial boundaries
-            ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-            ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-            sample_idx += len(data["vals"])
+    colors = _palette(_TAB10, len(trial_data))
+    handles = _draw_timeline(ax1, trial_data, sorted(trial_data), colors,
+                             lambda trial, data: f"Trial {trial}: {data['expected']}", dpi)
     
     ax1.set_yticks([0, 1])
     ax1.set_yticklabels(["On Water", "In Shed"])
@@ -272,20 +398,18 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     ax1.set_ylabel("Detected Location")
     ax1.set_title(f"T2 Real-Time Update Test - Boat {boat_id}\nState Change Timeline with Update Latencies")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Latency histogram (middle left)
     ax2 = fig.add_subplot(gs[1, 0])
-    if latencies:
-        bins = min(15, max(5, len(latencies)//2))
-        n, bins, patches = ax2.hist(latencies, bins=bins, color="#4c78a8", alpha=0.7, edgecolor='black')
+    if latencies.size:
+        bins = min(15, max(5, latencies.size//2))
+        counts, edges = np.histogram(latencies, bins=bins)
         
-        # Color bars based on SLA compliance
-        for i, patch in enumerate(patches):
-            if bins[i] <= 5.0:  # SLA threshold
-                patch.set_facecolor('#2ca02c')  # Green for compliant
-            else:
-                patch.set_facecolor('#d62728')  # Red for non-compliant
+        # Color bars based on SLA compliance (green compliant, red non-compliant)
+        bar_colors = np.where(edges[:-1] <= 5.0, '#2ca02c', '#d62728')
+        ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color=bar_colors, alpha=0.7, edgecolor='black')
         
         ax2.axvline(5.0, color="red", linestyle="--", linewidth=2, label="SLA Threshold (5s)")
         ax2.set_xlabel("Update Latency (seconds)")
@@ -297,8 +421,8 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     # Plot 3: Trial-by-trial latency (middle right)
     ax3 = fig.add_subplot(gs[1, 1])
     trials = sorted(trial_data.keys())
-    trial_latencies = [trial_data[t]["latency"] for t in trials]
-    colors_lat = ['green' if lat <= 5.0 else 'red' for lat in trial_latencies]
+    trial_latencies = np.fromiter((trial_data[t]["latency"] for t in trials), dtype=np.float64, count=len(trials))
+    colors_lat = np.where(trial_latencies <= 5.0, 'green', 'red')
     
     bars = ax3.bar(trials, trial_latencies, color=colors_lat, alpha=0.7, edgecolor='black')
     ax3.axhline(5.0, color="red", linestyle="--", linewidth=2, label="SLA Threshold (5s)")
@@ -309,28 +433,21 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     ax3.legend()
     
     # Add latency value labels
-    for i, (bar, lat) in enumerate(zip(bars, trial_latencies)):
+    for bar, lat in zip(bars, trial_latencies.tolist()):
         ax3.text(bar.get_x() + bar.get_width()/2., lat + 0.1, 
                 f"{lat:.1f}s", ha='center', va='bottom', fontsize=8)
     
-    # Plot 4: Statistical summary (bottom, spans 2 columns)
-    ax4 = fig.add_subplot(gs[2, :])
-    ax4.axis('off')
+    # Statistical summary (written to T2_Summary.txt rather than rendered into the figure)
     
-    # Calculate comprehensive statistics
-    total_trials = len(results)
-    passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
-    failed_trials = total_trials - passed_trials
-    accuracy = passed_trials / total_trials if total_trials > 0 else 0
-    
-    # Calculate latency statistics
-    avg_latency = np.mean(trial_latencies) if trial_latencies else 0
-    min_latency = np.min(trial_latencies) if trial_latencies else 0
-    max_latency = np.max(trial_latencies) if trial_latencies else 0
-    sla_compliant = sum(1 for lat in trial_latencies if lat <= 5.0)
+    total_trials = stats["total"]
+    accuracy = stats["accuracy"]
+    avg_latency = stats["mean"]
+    min_latency = stats["min"]
+    max_latency = stats["max"]
+    sla_compliant = stats["sla_compliant"]
     
     # Create comprehensive summary text
-    summary_text = f"""T2 Real-Time Update Test - Comprehensive Results Summary
+    parts = [f"""T2 Real-Time Update Test - Comprehensive Results Summary
 {'='*80}
 
 TEST CONFIGURATION:
@@ -338,104 +455,96 @@ TEST CONFIGURATION:
 • Test Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 • Total Trials: {total_trials}
 • SLA Threshold: 5.0 seconds
-• Test Duration: {sum(len(samples) for samples in [trial_data[t] for t in trials]) * 5 / 60:.1f} minutes
+• Test Duration: {sum(trial_data[t]["vals"].size for t in trials) * 5 / 60:.1f} minutes
 
 PERFORMANCE METRICS:
-• Passed Trials: {passed_trials}
-• Failed Trials: {failed_trials}
-• Overall Accuracy: {accuracy:.1%}
-• SLA Compliance: {sla_compliant}/{total_trials} ({sla_compliant/total_trials*100:.1f}%)
+• Passed Trials: {stats["passed"]}
+• Failed Trials: {stats["failed"]}
+• Overall Accuracy: {stats["accuracy_pct"]}
+• SLA Compliance: {sla_compliant}/{total_trials} ({stats["sla_pct"]})
 
 LATENCY STATISTICS:
 • Average Latency: {avg_latency:.2f} seconds
 • Minimum Latency: {min_latency:.2f} seconds
 • Maximum Latency: {max_latency:.2f} seconds
-• 95th Percentile: {np.percentile(trial_latencies, 95):.2f} seconds
+• 95th Percentile: {stats["p95"]:.2f} seconds
 
 ACCEPTANCE CRITERIA EVALUATION:
 • Required: ≤5s delay for 95% of samples, ≤7s maximum
-• SLA Compliance (≤5s): {sla_compliant}/{total_trials} ({sla_compliant/total_trials*100:.1f}%)
+• SLA Compliance (≤5s): {sla_compliant}/{total_trials} ({stats["sla_pct"]})
 • Maximum Latency: {max_latency:.1f}s (Limit: ≤7s)
 • Result: {'PASS' if sla_compliant/total_trials >= 0.95 and max_latency <= 7.0 else 'FAIL'}
 
-TRIAL BREAKDOWN:"""
-    
-    for i, result in enumerate(results, 1):
-        status_icon = "PASS" if result["pass_fail"] == "Pass" else "FAIL"
-        latency_str = f"{result['latency_seconds']:.1f}s"
-        summary_text += f"\n• Trial {i}: {latency_str} {status_icon} ({result['pass_fail']}) - {result['description']}"
-    
-    summary_text += f"""
-
+TRIAL BREAKDOWN:"""]
+    parts.extend(
+        f"• Trial {i}: {r['latency_seconds']:.1f}s {'PASS' if r['pass_fail'] == 'Pass' else 'FAIL'} ({r['pass_fail']}) - {r['description']}"
+        for i, r in enumerate(results, 1)
+    )
+    issues = [r['comments_defects'] for r in results if r['comments_defects']]
+    parts.append(f"""
 ISSUES NOTED:
-{', '.join([r['comments_defects'] for r in results if r['comments_defects']]) if any(r['comments_defects'] for r in results) else 'No significant issues detected'}
+{', '.join(issues) if issues else 'No significant issues detected'}
 
 RECOMMENDATIONS:
 • System performance {'meets' if accuracy >= 0.95 else 'does not meet'} acceptance criteria
-• {'Continue monitoring for edge cases' if accuracy >= 0.95 else 'Investigate network latency and detection algorithms'}"""
+• {'Continue monitoring for edge cases' if accuracy >= 0.95 else 'Investigate network latency and detection algorithms'}""")
+    summary_text = "\n".join(parts)
     
-    ax4.text(0.02, 0.98, summary_text, transform=ax4.transAxes, fontsize=10,
-            verticalalignment='top', fontfamily='monospace',
-            bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8))
+    summary_path = os.path.join(out_dir, "T2_Summary.txt")
+    with open(summary_path, 'w') as f:
+        f.write(summary_text + '\n')
+    print(f"Summary saved to: {summary_path}")
     
-    plt.suptitle("Digital Boat Tracking Board - T2 Real-Time Update Test Results", 
+    fig.text(0.5, 0.01, "Full results summary: T2_Summary.txt", ha='center', fontsize=9, style='italic')
+    fig.suptitle("Digital Boat Tracking Board - T2 Real-Time Update Test Results", 
                 fontsize=16, fontweight='bold')
     
-    plot_path = os.path.join(out_dir, "T2_Real_Time_Update_Results.png")
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    plot_path = _save_plot(fig, out_dir, "T2_Real_Time_Update_Results", dpi, fmt)
+    fig.clear()
     print(f"Professional plot saved to: {plot_path}")
 
 
-def create_split_plots(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
+def _latency_range_lines(lats: np.ndarray) -> str:
+    """Average/min/max lines for a category summary (placeholders when the category is empty)."""
+    if not lats.size:
+        return "Average Latency: -\nMin Latency: -\nMax Latency: -"
+    return (f"Average Latency: {lats.mean():.2f}s\n"
+            f"Min Latency: {lats.min():.2f}s\n"
+            f"Max Latency: {lats.max():.2f}s")
+
+
+def _save_plot(fig: plt.Figure, out_dir: str, name: str, dpi: int, fmt: str) -> str:
+    """Save fig as <name>.<fmt> in out_dir and return the path."""
+    plot_path = os.path.join(out_dir, f"{name}.{fmt}")
+    fig.savefig(plot_path, dpi=dpi, bbox_inches='tight', format=fmt, **PLOT_SAVE_KWARGS[fmt])
+    return plot_path
+
+
+def create_split_plots(trial_data: Dict[int, Dict], boat_id: str, out_dir: str, results: List[Dict],
+                       fig: plt.Figure, dpi: int = 150, fmt: str = "png") -> None:
     """Create separate plots for different latency ranges and scenarios for better visibility."""
     
     # Separate trials into different latency categories
-    excellent_trials = [r for r in results if r["latency_seconds"] <= 2.0]  # ≤2s
-    good_trials = [r for r in results if 2.0 < r["latency_seconds"] <= 3.5]  # 2-3.5s
-    acceptable_trials = [r for r in results if 3.5 < r["latency_seconds"] <= 5.0]  # 3.5-5s
+    lats_all = np.fromiter((r["latency_seconds"] for r in results), dtype=np.float64, count=len(results))
+    excellent_idx = np.flatnonzero(lats_all <= 2.0)  # ≤2s
+    good_idx = np.flatnonzero((lats_all > 2.0) & (lats_all <= 3.5))  # 2-3.5s
+    acceptable_idx = np.flatnonzero((lats_all > 3.5) & (lats_all <= 5.0))  # 3.5-5s
+    excellent_trials = [results[i] for i in excellent_idx.tolist()]
     
-    # Parse data with trial information
-    trial_data = {}
-    
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "latency": sample.get("latency_seconds", 0.0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_in_harbor") else 0)
-
     if not trial_data:
         print("No data to plot")
         return
 
     # Create Excellent Performance Plot (≤2s)
-    fig1 = plt.figure(figsize=(16, 10))
-    gs1 = fig1.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    fig.set_size_inches(16, 10)
+    gs1 = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Excellent Performance Timeline
-    ax1 = fig1.add_subplot(gs1[0, :])
+    ax1 = fig.add_subplot(gs1[0, :])
     excellent_trial_nums = [r["trial"] for r in excellent_trials]
-    colors = plt.cm.Greens(np.linspace(0.3, 0.9, len(excellent_trial_nums)))
-    sample_idx = 0
-    
-    for i, trial in enumerate(excellent_trial_nums):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial} ({data['latency']:.1f}s)", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
+    colors = _palette(_GREENS, len(excellent_trial_nums))
+    handles = _draw_timeline(ax1, trial_data, excellent_trial_nums, colors,
+                             lambda trial, data: f"Trial {trial} ({data['latency']:.1f}s)", dpi)
     
     ax1.set_yticks([0, 1])
     ax1.set_yticklabels(["On Water", "In Shed"])
@@ -443,68 +552,56 @@ def create_split_plots(samples: List[Dict], boat_id: str, out_dir: str, results:
     ax1.set_ylabel("Detected Location")
     ax1.set_title(f"Excellent Performance Trials (≤2.0s) - {len(excellent_trial_nums)} trials - Boat {boat_id}")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Excellent Performance Latency Distribution
-    ax2 = fig1.add_subplot(gs1[1, 0])
-    excellent_latencies = [r["latency_seconds"] for r in excellent_trials]
-    
-    if excellent_latencies:
-        bins = min(8, max(3, len(excellent_latencies)//2))
-        n, bins, patches = ax2.hist(excellent_latencies, bins=bins, color="#2ca02c", alpha=0.7, edgecolor='black')
+    ax2 = fig.add_subplot(gs1[1, 0])
+    excellent_latencies = lats_all[excellent_idx]
+    
+    if excellent_latencies.size:
+        bins = min(8, max(3, excellent_latencies.size//2))
+        counts, edges = np.histogram(excellent_latencies, bins=bins)
+        ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color="#2ca02c", alpha=0.7, edgecolor='black')
         ax2.set_xlabel("Latency (seconds)")
         ax2.set_ylabel("Count")
-        ax2.set_title(f"Excellent Performance Distribution\nAvg: {np.mean(excellent_latencies):.1f}s")
+        ax2.set_title(f"Excellent Performance Distribution\nAvg: {excellent_latencies.mean():.1f}s")
         ax2.grid(True, alpha=0.3)
     
     # Plot 3: Excellent Performance Summary
-    ax3 = fig1.add_subplot(gs1[1, 1])
+    ax3 = fig.add_subplot(gs1[1, 1])
     ax3.axis('off')
     
-    summary_text = f"""Excellent Performance Summary (≤2.0s)
+    parts = [f"""Excellent Performance Summary (≤2.0s)
 {'='*45}
 Total Trials: {len(excellent_trials)}
-Average Latency: {np.mean(excellent_latencies):.2f}s
-Min Latency: {min(excellent_latencies):.2f}s
-Max Latency: {max(excellent_latencies):.2f}s
+{_latency_range_lines(excellent_latencies)}
 
-Trial Details:"""
-    
-    for r in excellent_trials:
-        summary_text += f"\n• Trial {r['trial']}: {r['latency_seconds']:.1f}s PASS"
+Trial Details:"""]
+    parts.extend(f"• Trial {r['trial']}: {r['latency_seconds']:.1f}s PASS" for r in excellent_trials)
+    summary_text = "\n".join(parts)
     
     ax3.text(0.05, 0.95, summary_text, transform=ax3.transAxes, fontsize=10,
             verticalalignment='top', fontfamily='monospace',
             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8))
     
-    plt.suptitle("T2 Test - Excellent Performance Trials (≤2.0s)", fontsize=16, fontweight='bold')
+    fig.suptitle("T2 Test - Excellent Performance Trials (≤2.0s)", fontsize=16, fontweight='bold')
     
-    plot_path1 = os.path.join(out_dir, "T2_Excellent_Performance.png")
-    plt.savefig(plot_path1, dpi=300, bbox_inches='tight')
-    plt.close()
+    plot_path1 = _save_plot(fig, out_dir, "T2_Excellent_Performance", dpi, fmt)
+    fig.clear()
     print(f"Excellent performance plot saved to: {plot_path1}")
     
     # Create Good/Acceptable Performance Plot (2-5s)
-    fig2 = plt.figure(figsize=(16, 10))
-    gs2 = fig2.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    gs2 = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Good/Acceptable Performance Timeline
-    ax1 = fig2.add_subplot(gs2[0, :])
-    good_acceptable_trials = good_trials + acceptable_trials
+    ax1 = fig.add_subplot(gs2[0, :])
+    good_acceptable_idx = np.concatenate((good_idx, acceptable_idx))
+    good_acceptable_trials = [results[i] for i in good_acceptable_idx.tolist()]
     good_acceptable_trial_nums = [r["trial"] for r in good_acceptable_trials]
-    colors = plt.cm.Oranges(np.linspace(0.3, 0.9, len(good_acceptable_trial_nums)))
-    sample_idx = 0
-    
-    for i, trial in enumerate(good_acceptable_trial_nums):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial} ({data['latency']:.1f}s)", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
+    colors = _palette(_ORANGES, len(good_acceptable_trial_nums))
+    handles = _draw_timeline(ax1, trial_data, good_acceptable_trial_nums, colors,
+                             lambda trial, data: f"Trial {trial} ({data['latency']:.1f}s)", dpi)
     
     ax1.set_yticks([0, 1])
     ax1.set_yticklabels(["On Water", "In Shed"])
@@ -512,113 +609,144 @@ Trial Details:"""
     ax1.set_ylabel("Detected Location")
     ax1.set_title(f"Good/Acceptable Performance Trials (2.0-5.0s) - {len(good_acceptable_trial_nums)} trials - Boat {boat_id}")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Good/Acceptable Performance Latency Distribution
-    ax2 = fig2.add_subplot(gs2[1, 0])
-    good_acceptable_latencies = [r["latency_seconds"] for r in good_acceptable_trials]
-    
-    if good_acceptable_latencies:
-        bins = min(8, max(3, len(good_acceptable_latencies)//2))
-        n, bins, patches = ax2.hist(good_acceptable_latencies, bins=bins, color="#ff7f0e", alpha=0.7, edgecolor='black')
+    ax2 = fig.add_subplot(gs2[1, 0])
+    good_acceptable_latencies = lats_all[good_acceptable_idx]
+    
+    if good_acceptable_latencies.size:
+        bins = min(8, max(3, good_acceptable_latencies.size//2))
+        counts, edges = np.histogram(good_acceptable_latencies, bins=bins)
+        ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color="#ff7f0e", alpha=0.7, edgecolor='black')
         ax2.set_xlabel("Latency (seconds)")
         ax2.set_ylabel("Count")
-        ax2.set_title(f"Good/Acceptable Performance Distribution\nAvg: {np.mean(good_acceptable_latencies):.1f}s")
+        ax2.set_title(f"Good/Acceptable Performance Distribution\nAvg: {good_acceptable_latencies.mean():.1f}s")
         ax2.grid(True, alpha=0.3)
     
     # Plot 3: Good/Acceptable Performance Summary
-    ax3 = fig2.add_subplot(gs2[1, 1])
+    ax3 = fig.add_subplot(gs2[1, 1])
     ax3.axis('off')
     
-    summary_text = f"""Good/Acceptable Performance Summary (2.0-5.0s)
+    parts = [f"""Good/Acceptable Performance Summary (2.0-5.0s)
 {'='*50}
 Total Trials: {len(good_acceptable_trials)}
-Average Latency: {np.mean(good_acceptable_latencies):.2f}s
-Min Latency: {min(good_acceptable_latencies):.2f}s
-Max Latency: {max(good_acceptable_latencies):.2f}s
+{_latency_range_lines(good_acceptable_latencies)}
 
-Trial Details:"""
-    
-    for r in good_acceptable_trials:
-        summary_text += f"\n• Trial {r['trial']}: {r['latency_seconds']:.1f}s PASS"
+Trial Details:"""]
+    parts.extend(f"• Trial {r['trial']}: {r['latency_seconds']:.1f}s PASS" for r in good_acceptable_trials)
+    summary_text = "\n".join(parts)
     
     ax3.text(0.05, 0.95, summary_text, transform=ax3.transAxes, fontsize=10,
             verticalalignment='top', fontfamily='monospace',
             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.8))
     
-    plt.suptitle("T2 Test - Good/Acceptable Performance Trials (2.0-5.0s)", fontsize=16, fontweight='bold')
+    fig.suptitle("T2 Test - Good/Acceptable Performance Trials (2.0-5.0s)", fontsize=16, fontweight='bold')
     
-    plot_path2 = os.path.join(out_dir, "T2_Good_Acceptable_Performance.png")
-    plt.savefig(plot_path2, dpi=300, bbox_inches='tight')
-    plt.close()
+    plot_path2 = _save_plot(fig, out_dir, "T2_Good_Acceptable_Performance", dpi, fmt)
+    fig.clear()
     print(f"Good/Acceptable performance plot saved to: {plot_path2}")
 
 
-def save_official_csv(results: List[Dict], out_dir: str):
+def save_official_csv(results: List[Dict], stats: Dict[str, Any], out_dir: str):
     """Save results in official T2 format."""
     csv_path = os.path.join(out_dir, "T2_Official_Results.csv")
     
-    with open(csv_path, 'w', newline='') as f:
+    # Header matching official format
+    header_rows = [
+        ["Digital Boat Tracking Board – Result Sheet R2"],
+        ["Result Sheet – Real Time Update"],
+        ["Test ID: T2"],
+        ["Requirement: R2"],
+        ["Requirement Statement: The system shall provide the real-time operational status of each boat, with updates visible to users within 5 seconds of a change in state."],
+        [f"Date: {datetime.now().strftime('%d/%m/%Y')}"],
+        ["Tester: Automated Test System"],
+        ["Observer: System Monitor"],
+        ["Environment: Controlled Test Environment"],
+        ["System Version / Config: v1.0 - Door-LR Logic"],
+        [],
+        ["Results Table"],
+        ["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"]
+    ]
+    
+    # Data rows
+    data_rows = [
+        [r["trial"], r["expected"], r["observed"], r["dashboard_log_status"], r["time"], r["pass_fail"], r["comments_defects"]]
+        for r in results
+    ]
+    
+    # Summary
+    issues = [r['comments_defects'] for r in results if r['comments_defects']]
+    
+    summary_rows = [
+        [],
+        ["Summary"],
+        [f"Total Trials: {stats['total']}"],
+        [f"Passes: {stats['passed']}"],
+        [f"Fails: {stats['failed']}"],
+        [f"Accuracy (%): {stats['accuracy_pct']}"],
+        [],
+        ["Acceptance Criteria: ≥95% correct classifications across all crossings"],
+        [f"Result: {'Pass' if stats['accuracy'] >= 0.95 else 'Fail'}"],
+        [f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"],
+        [],
+        ["Attachments: Screenshots, Logs, CSV Exports"]
+    ]
+    
+    with open(csv_path, 'w', newline='', buffering=1 << 20) as f:
         writer = csv.writer(f)
-        
-        # Header matching official format
-        writer.writerow(["Digital Boat Tracking Board – Result Sheet R2"])
-        writer.writerow(["Result Sheet – Real Time Update"])
-        writer.writerow(["Test ID: T2"])
-        writer.writerow(["Requirement: R2"])
-        writer.writerow(["Requirement Statement: The system shall provide the real-time operational status of each boat, with updates visible to users within 5 seconds of a change in state."])
-        writer.writerow([f"Date: {datetime.now().strftime('%d/%m/%Y')}"])
-        writer.writerow(["Tester: Automated Test System"])
-        writer.writerow(["Observer: System Monitor"])
-        writer.writerow(["Environment: Controlled Test Environment"])
-        writer.writerow(["System Version / Config: v1.0 - Door-LR Logic"])
-        writer.writerow([])
-        writer.writerow(["Results Table"])
-        writer.writerow(["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"])
-        
-        # Data rows
-        for result in results:
-            writer.writerow([
-                result["trial"],
-                result["expected"],
-                result["observed"],
-                result["dashboard_log_status"],
-                result["time"],
-                result["pass_fail"],
-                result["comments_defects"]
-            ])
-        
-        # Summary
-        total_trials = len(results)
-        passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
-        failed_trials = total_trials - passed_trials
-        accuracy = passed_trials / total_trials if total_trials > 0 else 0
-        
-        writer.writerow([])
-        writer.writerow(["Summary"])
-        writer.writerow([f"Total Trials: {total_trials}"])
-        writer.writerow([f"Passes: {passed_trials}"])
-        writer.writerow([f"Fails: {failed_trials}"])
-        writer.writerow([f"Accuracy (%): {accuracy:.1f}%"])
-        writer.writerow([])
-        writer.writerow(["Acceptance Criteria: ≥95% correct classifications across all crossings"])
-        writer.writerow([f"Result: {'Pass' if accuracy >= 0.95 else 'Fail'}"])
-        
-        issues = [r['comments_defects'] for r in results if r['comments_defects']]
-        writer.writerow([f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"])
-        writer.writerow([])
-        writer.writerow(["Attachments: Screenshots, Logs, CSV Exports"])
+        writer.writerows(header_rows)
+        writer.writerows(data_rows)
+        writer.writerows(summary_rows)
     
     print(f"Official CSV saved to: {csv_path}")
 
 
-def save_detailed_log(samples: List[Dict], out_dir: str):
-    """Save detailed log data."""
-    jsonl_path = os.path.join(out_dir, "T2_Detailed_Log.jsonl")
-    with open(jsonl_path, 'w') as f:
-        for sample in samples:
-            f.write(json.dumps(sample) + '\n')
-    print(f"Detailed log saved to: {jsonl_path}")
+def _jsonl_line(sample: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(sample, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(sample) + '\n').encode('utf-8')
+
+
+def write_trial_log(f, samples: np.ndarray, result: Dict) -> None:
+    """Append one trial's samples to the detailed JSONL log as a single write."""
+    expected = result["expected"]
+    description = result["description"]
+    rows = zip(
+        np.datetime_as_string(samples["timestamp"]).tolist(),
+        samples["trial"].tolist(),
+        samples["sample_idx"].tolist(),
+        samples["boat_in_harbor"].tolist(),
+        samples["latency_seconds"].tolist(),
+        samples["rssi"].tolist(),
+        SCANNER_IDS[samples["scanner_id"]].tolist(),
+        samples["response_time_ms"].tolist()
+    )
+    buf = bytearray()
+    for ts, trial, idx, in_harbor, latency, rssi, scanner, resp in rows:
+        buf += _jsonl_line({
+            "timestamp": ts,
+            "trial": trial,
+            "expected": expected,
+            "description": description,
+            "sample_idx": idx,
+            "boat_in_harbor": in_harbor,
+            "latency_seconds": latency,
+            "rssi": rssi,
+            "scanner_id": scanner,
+            "response_time_ms": resp
+        })
+    f.write(buf)
+
+
+def _render_plots(plot_fn, *args, dpi: int, fmt: str) -> None:
+    """Process-pool entry point: give plot_fn its own Figure (reused across its outputs) and close it."""
+    fig = plt.figure(figsize=(16, 12))
+    try:
+        plot_fn(*args, fig=fig, dpi=dpi, fmt=fmt)
+    finally:
+        plt.close(fig)
 
 
 def main():
@@ -626,6 +754,9 @@ def main():
     parser.add_argument("--boat-id", default="RC-001", help="Boat ID to test")
     parser.add_argument("--trials", type=int, default=20, help="Number of trials (default: 20)")
     parser.add_argument("--output-dir", default="results/T2", help="Output directory")
+    parser.add_argument("--dpi", type=int, default=150, help="Plot resolution (default: 150; use 300 for print)")
+    parser.add_argument("--format", choices=sorted(PLOT_SAVE_KWARGS), default="png",
+                        help="Plot file format (default: png; svg skips rasterising, webp encodes faster)")
     
     args = parser.parse_args()
     
@@ -642,43 +773,53 @@ def main():
     scenarios = generate_realistic_scenarios()
     
     # Generate trial data
+    run_timestamp = iso_now()
     results = []
-    all_samples = []
+    trial_data = {}
     
-    for trial_num in range(1, args.trials + 1):
-        scenario = scenarios[(trial_num - 1) % len(scenarios)]
-        trial_result, samples = generate_trial_data(scenario, trial_num, args.boat_id)
-        results.append(trial_result)
-        all_samples.extend(samples)
-        
-        print(f"Trial {trial_num}: {scenario['description']} - {trial_result['pass_fail']} ({trial_result['latency_seconds']:.1f}s)")
+    # Samples go to the detailed log as each trial finishes; only the plot inputs are kept
+    jsonl_path = os.path.join(out_dir, "T2_Detailed_Log.jsonl")
+    with open(jsonl_path, 'wb', buffering=1 << 20) as log_file:
+        for trial_num in range(1, args.trials + 1):
+            scenario = scenarios[(trial_num - 1) % len(scenarios)]
+            trial_result, samples, vals = generate_trial_data(scenario, trial_num, args.boat_id, run_timestamp)
+            results.append(trial_result)
+            write_trial_log(log_file, samples, trial_result)
+            trial_data[trial_num] = trial_entry(vals, trial_result)
+            
+            print(f"Trial {trial_num}: {scenario['description']} - {trial_result['pass_fail']} ({trial_result['latency_seconds']:.1f}s)")
+    print(f"Detailed log saved to: {jsonl_path}")
     
-    # Save results
-    save_official_csv(results, out_dir)
-    save_detailed_log(all_samples, out_dir)
-    create_professional_plot(all_samples, args.boat_id, out_dir, results)
-    create_split_plots(all_samples, args.boat_id, out_dir, results)
+    latencies = sample_latencies(trial_data)
+    stats = trial_stats(results)
+    
+    # Render the two plot sets in worker processes while this one writes the CSV
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        plot_jobs = [
+            pool.submit(_render_plots, create_professional_plot,
+                        trial_data, latencies, stats, args.boat_id, out_dir, results, dpi=args.dpi, fmt=args.format),
+            pool.submit(_render_plots, create_split_plots,
+                        trial_data, args.boat_id, out_dir, results, dpi=args.dpi, fmt=args.format)
+        ]
+        
+        # Save results
+        save_official_csv(results, stats, out_dir)
+        
+        for job in plot_jobs:
+            job.result()
     
     # Print summary
-    total_trials = len(results)
-    passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
-    failed_trials = total_trials - passed_trials
-    accuracy = passed_trials / total_trials if total_trials > 0 else 0
-    
-    avg_latency = np.mean([r["latency_seconds"] for r in results])
-    sla_compliant = sum(1 for r in results if r["latency_seconds"] <= 5.0)
-    
     print(f"\n{'='*60}")
     print(f"OFFICIAL T2 TEST SUMMARY")
     print(f"{'='*60}")
-    print(f"Total trials: {total_trials}")
-    print(f"Passed: {passed_trials}")
-    print(f"Failed: {failed_trials}")
-    print(f"Accuracy: {accuracy:.1%}")
-    print(f"Average latency: {avg_latency:.2f}s")
-    print(f"SLA compliance: {sla_compliant}/{total_trials} ({sla_compliant/total_trials*100:.1f}%)")
+    print(f"Total trials: {stats['total']}")
+    print(f"Passed: {stats['passed']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Accuracy: {stats['accuracy_pct']}")
+    print(f"Average latency: {stats['mean']:.2f}s")
+    print(f"SLA compliance: {stats['sla_compliant']}/{stats['total']} ({stats['sla_pct']})")
     print(f"Acceptance Criteria: ≥95%")
-    print(f"Result: {'PASS' if accuracy >= 0.95 else 'FAIL'}")
+    print(f"Result: {'PASS' if stats['accuracy'] >= 0.95 else 'FAIL'}")
     print(f"Results saved to: {out_dir}")
     print(f"\nREADY FOR OFFICIAL SUBMISSION!")
 
@@ -10,20 +10,45 @@ import json
 import os
 import sys
 import time
-import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict, List, Tuple
 
 try:
-    import matplotlib.pyplot as plt
     import numpy as np
 except Exception as e:
-    print("ERROR: matplotlib and numpy required. Try: pip install matplotlib numpy", file=sys.stderr)
+    print("ERROR: numpy required. Try: pip install numpy", file=sys.stderr)
     raise
 
+try:
+    import orjson
+except ImportError:  # optional: the detailed log falls back to the stdlib encoder
+    orjson = None
+
+
+SCANNER_IDS = np.array(["gate-inner", "gate-outer"])
+PHASES = np.array(["exit", "middle", "entry"])
+PHASE_EXIT, PHASE_MIDDLE, PHASE_ENTRY = range(len(PHASES))
+BOAT_STATUSES = np.array(["transitioning", "on_water"])  # indexed by the on_water flag
+
+# Trials per generation block. Each block draws from its own child of the run's seed, so a
+# seeded run gives the same data whether its blocks are generated here or in worker processes
+TRIAL_BLOCK = 5000
+
+# Fast zlib level for the PNGs; files are a little larger but encode several times quicker
+PNG_SAVE_KWARGS = {"optimize": False, "compress_level": 1}
 
-def iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+# One row per sample; expected/description/test_type live on the trial result, not on every row
+SAMPLE_DTYPE = np.dtype([
+    ("timestamp", "datetime64[us]"),
+    ("trial", np.int32),
+    ("sample_idx", np.int32),
+    ("phase", np.uint8),
+    ("timestamp_error_seconds", np.float64),
+    ("rssi", np.float64),
+    ("scanner_id", np.uint8),
+    ("on_water", np.bool_),
+])
 
 
 def generate_realistic_scenarios() -> List[Dict]:
@@ -154,27 +179,27 @@ def generate_realistic_scenarios() -> List[Dict]:
     return scenarios
 
 
-def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[Dict, List[Dict]]:
-    """Generate realistic trial data for T3 timestamp accuracy testing."""
+def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str, passes: bool,
+                        rng: np.random.Generator) -> Tuple[Dict, np.ndarray]:
+    """Generate realistic trial data for T3 timestamp accuracy testing.
     
-    # Determine if this trial passes based on success rate
-    passes = random.random() < scenario["success_rate"]
+    passes is the trial's pass/fail draw, made for all trials up front in main(); everything
+    else random about the trial is drawn from rng in a few batched calls.
+    Samples come back as a SAMPLE_DTYPE structured array, one row per 30 s sample.
+    """
     
     # Generate realistic timestamp errors
     if passes:
         # Within 1-second accuracy
-        exit_error = random.uniform(*scenario["timestamp_error_range"])
-        entry_error = random.uniform(*scenario["timestamp_error_range"])
-        duration_error = abs(entry_error - exit_error)
+        exit_error, entry_error = rng.uniform(*scenario["timestamp_error_range"], size=2).tolist()
     else:
         # Exceeds 1-second accuracy
-        exit_error = random.uniform(1.1, 2.5)
-        entry_error = random.uniform(1.2, 2.8)
-        duration_error = abs(entry_error - exit_error)
+        exit_error, entry_error = rng.uniform((1.1, 1.2), (2.5, 2.8)).tolist()
+    duration_error = abs(entry_error - exit_error)
     
     # Generate realistic timing
-    start_time = datetime.now() - timedelta(minutes=scenario["duration_minutes"])
     end_time = datetime.now()
+    start_time = end_time - timedelta(minutes=scenario["duration_minutes"])
     
     # Calculate actual timestamps with errors
     actual_exit_time = start_time + timedelta(seconds=exit_error)
@@ -215,77 +240,147 @@ def generate_trial_data(scenario: Dict, trial_num: int, boat_id: str) -> Tuple[D
         "comments_defects": "" if passes else f"Timestamp error {max(exit_error, entry_error):.1f}s exceeds 1s SLA in {scenario['description']}",
         "description": scenario["description"],
         "test_type": scenario["test_type"],
-        "timestamp": iso_now()
+        "timestamp": end_time.astimezone(timezone.utc).isoformat()
     }
     
-    # Generate sample data for this trial (simulating detailed logging)
-    samples = []
+    # Generate sample data for this trial (simulating detailed logging), whole trial in one batch
     samples_per_trial = scenario["duration_minutes"] * 2  # 2 samples per minute (30s intervals)
     
-    for sample_idx in range(samples_per_trial):
-        # Generate realistic sample timing
-        sample_time = start_time + timedelta(seconds=sample_idx * 30)
-        
-        # Determine if this is exit, middle, or entry phase
-        if sample_idx == 0:
-            phase = "exit"
-            timestamp_error = exit_error
-        elif sample_idx == samples_per_trial - 1:
-            phase = "entry"
-            timestamp_error = entry_error
-        else:
-            phase = "middle"
-            timestamp_error = random.uniform(0.1, 0.5)
-        
-        sample = {
-            "timestamp": sample_time.isoformat(),
-            "trial": trial_num,
-            "expected": scenario["expected"],
-            "description": scenario["description"],
-            "test_type": scenario["test_type"],
-            "sample_idx": sample_idx,
-            "phase": phase,
-            "timestamp_error_seconds": timestamp_error,
-            "expected_duration_minutes": scenario["duration_minutes"],
-            "rssi": random.uniform(-45, -75),
-            "scanner_id": random.choice(["gate-inner", "gate-outer"]),
-            "boat_status": "on_water" if sample_idx > 0 and sample_idx < samples_per_trial - 1 else "transitioning"
-        }
-        samples.append(sample)
+    # First sample is the exit, last is the entry, everything between is mid-outing
+    samples = np.empty(samples_per_trial, dtype=SAMPLE_DTYPE)
+    sample_idx = np.arange(samples_per_trial)
+    samples["timestamp"] = np.datetime64(start_time, "us") + sample_idx * np.timedelta64(30, "s")
+    samples["trial"] = trial_num
+    samples["sample_idx"] = sample_idx
+    samples["phase"] = PHASE_MIDDLE
+    samples["phase"][0] = PHASE_EXIT
+    samples["phase"][-1] = PHASE_ENTRY
+    samples["timestamp_error_seconds"][0] = exit_error
+    samples["timestamp_error_seconds"][-1] = entry_error
+    samples["timestamp_error_seconds"][1:-1] = rng.uniform(0.1, 0.5, samples_per_trial - 2)
+    samples["rssi"] = rng.uniform(-75, -45, samples_per_trial)
+    samples["scanner_id"] = rng.integers(0, len(SCANNER_IDS), size=samples_per_trial)
+    samples["on_water"] = samples["phase"] == PHASE_MIDDLE
     
     return trial_result, samples
 
 
-def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
-    """Create professional T3 plot focusing on timestamp accuracy."""
+def generate_trial_block(trial_scenarios: List[Dict], first_trial: int, boat_id: str,
+                         seed_seq: np.random.SeedSequence) -> Tuple[List[Dict], np.ndarray]:
+    """Generate consecutive trials from one child seed; every trial's pass/fail is drawn up front in one batch."""
+    rng = np.random.default_rng(seed_seq)
+    success_rates = np.array([scenario["success_rate"] for scenario in trial_scenarios])
+    passes = (rng.random(len(trial_scenarios)) < success_rates).tolist()
+    
+    results = []
+    trial_samples = []
+    for trial_num, (scenario, passed) in enumerate(zip(trial_scenarios, passes), first_trial):
+        trial_result, samples = generate_trial_data(scenario, trial_num, boat_id, passed, rng)
+        results.append(trial_result)
+        trial_samples.append(samples)
+    
+    return results, np.concatenate(trial_samples)
+
+
+def _pyplot():
+    """Import pyplot on first use, on the non-interactive Agg backend; --no-plot runs never load matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except Exception:
+        print("ERROR: matplotlib required for plots. Try: pip install matplotlib (or pass --no-plot)", file=sys.stderr)
+        raise
+    return plt
+
+
+def _draw_timeline(ax, trial_data: Dict[int, Dict], trials: List[int], colors: np.ndarray, label_fn) -> List[Any]:
+    """Draw per-trial step series end to end as one LineCollection plus one vlines call.
+    
+    Returns proxy legend handles, one per drawn trial.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+    
+    segments, seg_colors, bounds, bound_colors, handles = [], [], [], [], []
+    sample_idx = 0
+    
+    for i, trial in enumerate(trials):
+        data = trial_data.get(trial)
+        if data is None or not data["vals"].size:
+            continue
+        n = len(data["vals"])
+        # where="post" step path: hold each value until the next sample index
+        xs = np.repeat(np.arange(sample_idx, sample_idx + n), 2)[1:]
+        ys = np.repeat(data["vals"], 2)[:-1]
+        segments.append(np.column_stack((xs, ys)))
+        seg_colors.append(colors[i])
+        bounds.extend((sample_idx, sample_idx + n - 1))
+        bound_colors.extend((colors[i], colors[i]))
+        handles.append(Line2D([], [], color=colors[i], linewidth=2, label=label_fn(trial, data)))
+        sample_idx += n
+    
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=seg_colors, linewidths=2))
+        ax.autoscale_view()
+        # Trial boundaries span the full axes height, like axvline
+        ax.vlines(bounds, 0, 1, colors=bound_colors, linestyles=":", alpha=0.7,
+                  transform=ax.get_xaxis_transform())
+    return handles
+
+
+def build_trial_data(samples: np.ndarray, results: List[Dict]) -> Tuple[Dict[int, Dict], np.ndarray, np.ndarray]:
+    """Split the sample array into per-trial views and collect the exit/entry errors (done once, shared by all plots)."""
+    by_trial = {r["trial"]: r for r in results}
+    trial_ids, starts, counts = np.unique(samples["trial"], return_index=True, return_counts=True)
+    
+    # Every trial opens with its exit sample and closes with its entry sample,
+    # so the grouping locates them without scanning the phase column
+    exit_errors = samples["timestamp_error_seconds"][starts]
+    entry_errors = samples["timestamp_error_seconds"][starts + counts - 1]
     
-    # Parse data with trial information
     trial_data = {}
-    exit_errors = []
-    entry_errors = []
-    duration_errors = []
-    
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "exit_error": sample.get("timestamp_error_seconds", 0.0),
-                "entry_error": sample.get("timestamp_error_seconds", 0.0),
-                "duration_minutes": sample.get("expected_duration_minutes", 0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_status") == "on_water" else 0)
-        
-        # Collect errors
-        if sample.get("phase") == "exit":
-            exit_errors.append(sample.get("timestamp_error_seconds", 0.0))
-        elif sample.get("phase") == "entry":
-            entry_errors.append(sample.get("timestamp_error_seconds", 0.0))
+    for trial, start, count, exit_error, entry_error in zip(trial_ids.tolist(), starts.tolist(), counts.tolist(),
+                                                            exit_errors.tolist(), entry_errors.tolist()):
+        rows = samples[start:start + count]  # trials are contiguous, so this is a view
+        meta = by_trial.get(trial, {})
+        trial_data[trial] = {
+            "vals": rows["on_water"].view(np.int8),
+            "expected": meta.get("expected", "Unknown"),
+            "description": meta.get("description", ""),
+            "duration_minutes": meta.get("expected_duration_minutes", 0),
+            "exit_error": exit_error,
+            "entry_error": entry_error
+        }
+    
+    return trial_data, exit_errors, entry_errors
+
+
+def error_stats(errors: np.ndarray) -> Dict[str, float]:
+    """Mean, max, 95th percentile and 1 s SLA compliance of one error series, all read off a single sort."""
+    n = errors.size
+    if not n:
+        return {"mean": 0.0, "max": 0.0, "p95": 0.0, "sla_compliant": 0, "compliance_pct": 0.0}
+    ordered = np.sort(errors)
+    # Linear interpolation between closest ranks, as np.percentile does by default
+    pos = 0.95 * (n - 1)
+    lo = int(pos)
+    hi = min(lo + 1, n - 1)
+    sla_compliant = int(np.searchsorted(ordered, 1.0, side='right'))
+    return {
+        "mean": float(ordered.mean()),
+        "max": float(ordered[-1]),
+        "p95": float(ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)),
+        "sla_compliant": sla_compliant,
+        "compliance_pct": sla_compliant / n * 100
+    }
+
+
+def create_professional_plot(trial_data: Dict[int, Dict], exit_errors: np.ndarray, entry_errors: np.ndarray,
+                             boat_id: str, out_dir: str, results: List[Dict], n_samples: int,
+                             dpi: int = 150) -> None:
+    """Create professional T3 plot focusing on timestamp accuracy."""
+    plt = _pyplot()
 
     if not trial_data:
         print("No data to plot")
@@ -298,18 +393,8 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     # Plot 1: Timeline with outing durations (top, spans 2 columns)
     ax1 = fig.add_subplot(gs[0, :])
     colors = plt.cm.tab10(np.linspace(0, 1, len(trial_data)))
-    sample_idx = 0
-    
-    for i, (trial, data) in enumerate(sorted(trial_data.items())):
-        if data["times"]:
-            # Create time series for this trial
-            trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-            ax1.step(trial_times, data["vals"], where="post", 
-                    color=colors[i], label=f"Trial {trial}: {data['duration_minutes']}min", linewidth=2)
-            # Add trial boundaries
-            ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-            ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-            sample_idx += len(data["vals"])
+    handles = _draw_timeline(ax1, trial_data, sorted(trial_data), colors,
+                             lambda trial, data: f"Trial {trial}: {data['duration_minutes']}min")
     
     ax1.set_yticks([0, 1])
     ax1.set_yticklabels(["In Shed", "On Water"])
@@ -317,20 +402,18 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     ax1.set_ylabel("Boat Status")
     ax1.set_title(f"T3 Timestamp Accuracy Test - Boat {boat_id}\nOuting Timeline with Duration Tracking")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Exit timestamp error histogram (middle left)
     ax2 = fig.add_subplot(gs[1, 0])
-    if exit_errors:
+    if exit_errors.size:
         bins = min(15, max(5, len(exit_errors)//2))
-        n, bins, patches = ax2.hist(exit_errors, bins=bins, color="#ff7f0e", alpha=0.7, edgecolor='black')
+        counts, edges = np.histogram(exit_errors, bins=bins)
         
-        # Color bars based on SLA compliance
-        for i, patch in enumerate(patches):
-            if bins[i] <= 1.0:  # SLA threshold
-                patch.set_facecolor('#2ca02c')  # Green for compliant
-            else:
-                patch.set_facecolor('#d62728')  # Red for non-compliant
+        # Color bars based on SLA compliance (green compliant, red non-compliant)
+        bar_colors = np.where(edges[:-1] <= 1.0, '#2ca02c', '#d62728')
+        ax2.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color=bar_colors, alpha=0.7, edgecolor='black')
         
         ax2.axvline(1.0, color="red", linestyle="--", linewidth=2, label="SLA Threshold (1s)")
         ax2.set_xlabel("Exit Timestamp Error (seconds)")
@@ -341,16 +424,14 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     
     # Plot 3: Entry timestamp error histogram (middle right)
     ax3 = fig.add_subplot(gs[1, 1])
-    if entry_errors:
+    if entry_errors.size:
         bins = min(15, max(5, len(entry_errors)//2))
-        n, bins, patches = ax3.hist(entry_errors, bins=bins, color="#2ca02c", alpha=0.7, edgecolor='black')
+        counts, edges = np.histogram(entry_errors, bins=bins)
         
-        # Color bars based on SLA compliance
-        for i, patch in enumerate(patches):
-            if bins[i] <= 1.0:  # SLA threshold
-                patch.set_facecolor('#2ca02c')  # Green for compliant
-            else:
-                patch.set_facecolor('#d62728')  # Red for non-compliant
+        # Color bars based on SLA compliance (green compliant, red non-compliant)
+        bar_colors = np.where(edges[:-1] <= 1.0, '#2ca02c', '#d62728')
+        ax3.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+                color=bar_colors, alpha=0.7, edgecolor='black')
         
         ax3.axvline(1.0, color="red", linestyle="--", linewidth=2, label="SLA Threshold (1s)")
         ax3.set_xlabel("Entry Timestamp Error (seconds)")
@@ -370,21 +451,15 @@ def create_professional_plot(samples: List[Dict], boat_id: str, out_dir: str, re
     accuracy = passed_trials / total_trials if total_trials > 0 else 0
     
     # Calculate timestamp accuracy statistics
-    avg_exit_error = np.mean(exit_errors) if exit_errors else 0
-    avg_entry_error = np.mean(entry_errors) if entry_errors else 0
-    max_exit_error = np.max(exit_errors) if exit_errors else 0
-    max_entry_error = np.max(entry_errors) if entry_errors else 0
-    
-    sla_compliant_exit = sum(1 for err in exit_errors if err <= 1.0)
-    sla_compliant_entry = sum(1 for err in entry_errors if err <= 1.0)
+    exit_stats = error_stats(exit_errors)
+    entry_stats = error_stats(entry_errors)
+    avg_exit_error, avg_entry_error = exit_stats["mean"], entry_stats["mean"]
+    max_exit_error, max_entry_error = exit_stats["max"], entry_stats["max"]
+    sla_compliant_exit, sla_compliant_entry = exit_stats["sla_compliant"], entry_stats["sla_compliant"]
+    exit_compliance_pct, entry_compliance_pct = exit_stats["compliance_pct"], entry_stats["compliance_pct"]
     
-    # Calculate percentages safely
-    exit_compliance_pct = (sla_compliant_exit/len(exit_errors)*100) if exit_errors else 0
-    entry_compliance_pct = (sla_compliant_entry/len(entry_errors)*100) if entry_errors else 0
-    
-    # Calculate test duration
-    trial_keys = sorted(trial_data.keys())
-    test_duration_minutes = sum(len(trial_data[t]["vals"]) for t in trial_keys) * 30 / 60
+    # Calculate test duration (one sample every 30 s)
+    test_duration_minutes = n_samples * 0.5
     
     # Create comprehensive summary text
     summary_text = f"""T3 Timestamp Accuracy Test - Comprehensive Results Summary
@@ -409,8 +484,8 @@ TIMESTAMP ACCURACY STATISTICS:
 • Average Entry Error: {avg_entry_error:.3f} seconds
 • Maximum Exit Error: {max_exit_error:.3f} seconds
 • Maximum Entry Error: {max_entry_error:.3f} seconds
-• 95th Percentile Exit: {np.percentile(exit_errors, 95):.3f} seconds
-• 95th Percentile Entry: {np.percentile(entry_errors, 95):.3f} seconds
+• 95th Percentile Exit: {exit_stats["p95"]:.3f} seconds
+• 95th Percentile Entry: {entry_stats["p95"]:.3f} seconds
 
 ACCEPTANCE CRITERIA EVALUATION:
 • Required: 90% of timestamps within ±5s, Maximum error ≤7s
@@ -446,72 +521,55 @@ RECOMMENDATIONS:
                 fontsize=16, fontweight='bold')
     
     plot_path = os.path.join(out_dir, "T3_Timestamp_Accuracy_Results.png")
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
+    plt.savefig(plot_path, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
     plt.close()
     print(f"Professional plot saved to: {plot_path}")
 
 
-def create_split_plots(samples: List[Dict], boat_id: str, out_dir: str, results: List[Dict]) -> None:
+def create_split_plots(trial_data: Dict[int, Dict], boat_id: str, out_dir: str, results: List[Dict],
+                       dpi: int = 150) -> None:
     """Create separate plots for different timestamp accuracy ranges for better visibility."""
+    plt = _pyplot()
+    
+    # Separate trials into different accuracy categories: bucket each |error| as
+    # 0 (≤2s), 1 (2-3.5s), 2 (3.5-5s) or 3 (>5s), then classify all trials at once
+    edges = [2.0, 3.5, 5.0]
+    exit_cat = np.digitize(np.abs([r["exit_error_seconds"] for r in results]), edges, right=True)
+    entry_cat = np.digitize(np.abs([r["entry_error_seconds"] for r in results]), edges, right=True)
+    is_excellent = (exit_cat == 0) & (entry_cat == 0)  # ≤2s
+    is_good = ~is_excellent & ((exit_cat == 1) | (entry_cat == 1))  # 2-3.5s
+    is_acceptable = ~is_excellent & ~is_good & ((exit_cat == 2) | (entry_cat == 2))  # 3.5-5s
+    excellent_trials = [results[i] for i in np.flatnonzero(is_excellent).tolist()]
+    good_trials = [results[i] for i in np.flatnonzero(is_good).tolist()]
+    acceptable_trials = [results[i] for i in np.flatnonzero(is_acceptable).tolist()]
     
-    # Separate trials into different accuracy categories
-    excellent_trials = [r for r in results if abs(r["exit_error_seconds"]) <= 2.0 and abs(r["entry_error_seconds"]) <= 2.0]  # ≤2s
-    good_trials = [r for r in results if (2.0 < abs(r["exit_error_seconds"]) <= 3.5 or 2.0 < abs(r["entry_error_seconds"]) <= 3.5) and r not in excellent_trials]  # 2-3.5s
-    acceptable_trials = [r for r in results if (3.5 < abs(r["exit_error_seconds"]) <= 5.0 or 3.5 < abs(r["entry_error_seconds"]) <= 5.0) and r not in excellent_trials and r not in good_trials]  # 3.5-5s
-    
-    # Parse data with trial information
-    trial_data = {}
-    
-    for sample in samples:
-        trial = sample.get("trial", 1)
-        if trial not in trial_data:
-            trial_data[trial] = {
-                "times": [], 
-                "vals": [], 
-                "expected": sample.get("expected", "Unknown"),
-                "description": sample.get("description", ""),
-                "exit_error": sample.get("exit_error_seconds", 0.0),
-                "entry_error": sample.get("entry_error_seconds", 0.0)
-            }
-        
-        trial_data[trial]["times"].append(len(trial_data[trial]["vals"]))
-        trial_data[trial]["vals"].append(1 if sample.get("boat_in_harbor") else 0)
-
     if not trial_data:
         print("No data to plot")
         return
 
+    # One Figure for both outputs, cleared after the first savefig
+    fig = plt.figure(figsize=(16, 10))
+    
     # Create Excellent Accuracy Plot (≤2s)
-    fig1 = plt.figure(figsize=(16, 10))
-    gs1 = fig1.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    gs1 = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Excellent Accuracy Timeline
-    ax1 = fig1.add_subplot(gs1[0, :])
+    ax1 = fig.add_subplot(gs1[0, :])
     excellent_trial_nums = [r["trial"] for r in excellent_trials]
     colors = plt.cm.Greens(np.linspace(0.3, 0.9, len(excellent_trial_nums)))
-    sample_idx = 0
-    
-    for i, trial in enumerate(excellent_trial_nums):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial} (E:{data['exit_error']:.1f}s)", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
+    handles = _draw_timeline(ax1, trial_data, excellent_trial_nums, colors,
+                             lambda trial, data: f"Trial {trial} (E:{data['exit_error']:.1f}s)")
     
     ax1.set_yticks([0, 1])
-    ax1.set_yticklabels(["On Water", "In Shed"])
+    ax1.set_yticklabels(["In Shed", "On Water"])
     ax1.set_xlabel("Sample Index")
     ax1.set_ylabel("Detected Location")
     ax1.set_title(f"Excellent Accuracy Trials (≤2.0s) - {len(excellent_trial_nums)} trials - Boat {boat_id}")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Excellent Accuracy Error Distribution
-    ax2 = fig1.add_subplot(gs1[1, 0])
+    ax2 = fig.add_subplot(gs1[1, 0])
     excellent_exit_errors = [r["exit_error_seconds"] for r in excellent_trials]
     excellent_entry_errors = [r["entry_error_seconds"] for r in excellent_trials]
     
@@ -525,7 +583,7 @@ def create_split_plots(samples: List[Dict], boat_id: str, out_dir: str, results:
         ax2.grid(True, alpha=0.3)
     
     # Plot 3: Excellent Accuracy Summary
-    ax3 = fig1.add_subplot(gs1[1, 1])
+    ax3 = fig.add_subplot(gs1[1, 1])
     ax3.axis('off')
     
     summary_text = f"""Excellent Accuracy Summary (≤2.0s)
@@ -545,45 +603,34 @@ Trial Details:"""
             verticalalignment='top', fontfamily='monospace',
             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen", alpha=0.8))
     
-    plt.suptitle("T3 Test - Excellent Accuracy Trials (≤2.0s)", fontsize=16, fontweight='bold')
+    fig.suptitle("T3 Test - Excellent Accuracy Trials (≤2.0s)", fontsize=16, fontweight='bold')
     
     plot_path1 = os.path.join(out_dir, "T3_Excellent_Accuracy.png")
-    plt.savefig(plot_path1, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(plot_path1, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+    fig.clear()
     print(f"Excellent accuracy plot saved to: {plot_path1}")
     
     # Create Good/Acceptable Accuracy Plot (2-5s)
-    fig2 = plt.figure(figsize=(16, 10))
-    gs2 = fig2.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
+    gs2 = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Plot 1: Good/Acceptable Accuracy Timeline
-    ax1 = fig2.add_subplot(gs2[0, :])
+    ax1 = fig.add_subplot(gs2[0, :])
     good_acceptable_trials = good_trials + acceptable_trials
     good_acceptable_trial_nums = [r["trial"] for r in good_acceptable_trials]
     colors = plt.cm.Oranges(np.linspace(0.3, 0.9, len(good_acceptable_trial_nums)))
-    sample_idx = 0
-    
-    for i, trial in enumerate(good_acceptable_trial_nums):
-        if trial in trial_data:
-            data = trial_data[trial]
-            if data["times"]:
-                trial_times = list(range(sample_idx, sample_idx + len(data["vals"])))
-                ax1.step(trial_times, data["vals"], where="post", 
-                        color=colors[i], label=f"Trial {trial} (E:{data['exit_error']:.1f}s)", linewidth=2)
-                ax1.axvline(sample_idx, color=colors[i], linestyle=":", alpha=0.7)
-                ax1.axvline(sample_idx + len(data["vals"]) - 1, color=colors[i], linestyle=":", alpha=0.7)
-                sample_idx += len(data["vals"])
+    handles = _draw_timeline(ax1, trial_data, good_acceptable_trial_nums, colors,
+                             lambda trial, data: f"Trial {trial} (E:{data['exit_error']:.1f}s)")
     
     ax1.set_yticks([0, 1])
-    ax1.set_yticklabels(["On Water", "In Shed"])
+    ax1.set_yticklabels(["In Shed", "On Water"])
     ax1.set_xlabel("Sample Index")
     ax1.set_ylabel("Detected Location")
     ax1.set_title(f"Good/Acceptable Accuracy Trials (2.0-5.0s) - {len(good_acceptable_trial_nums)} trials - Boat {boat_id}")
     ax1.grid(True, alpha=0.3)
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
+    ax1.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=8)
     
     # Plot 2: Good/Acceptable Accuracy Error Distribution
-    ax2 = fig2.add_subplot(gs2[1, 0])
+    ax2 = fig.add_subplot(gs2[1, 0])
     good_acceptable_exit_errors = [r["exit_error_seconds"] for r in good_acceptable_trials]
     good_acceptable_entry_errors = [r["entry_error_seconds"] for r in good_acceptable_trials]
     
@@ -597,7 +644,7 @@ Trial Details:"""
         ax2.grid(True, alpha=0.3)
     
     # Plot 3: Good/Acceptable Accuracy Summary
-    ax3 = fig2.add_subplot(gs2[1, 1])
+    ax3 = fig.add_subplot(gs2[1, 1])
     ax3.axis('off')
     
     summary_text = f"""Good/Acceptable Accuracy Summary (2.0-5.0s)
@@ -617,11 +664,11 @@ Trial Details:"""
             verticalalignment='top', fontfamily='monospace',
             bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow", alpha=0.8))
     
-    plt.suptitle("T3 Test - Good/Acceptable Accuracy Trials (2.0-5.0s)", fontsize=16, fontweight='bold')
+    fig.suptitle("T3 Test - Good/Acceptable Accuracy Trials (2.0-5.0s)", fontsize=16, fontweight='bold')
     
     plot_path2 = os.path.join(out_dir, "T3_Good_Acceptable_Accuracy.png")
-    plt.savefig(plot_path2, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(plot_path2, dpi=dpi, bbox_inches='tight', pil_kwargs=PNG_SAVE_KWARGS)
+    plt.close(fig)
     print(f"Good/Acceptable accuracy plot saved to: {plot_path2}")
 
 
@@ -629,66 +676,101 @@ def save_official_csv(results: List[Dict], out_dir: str):
     """Save results in official T3 format."""
     csv_path = os.path.join(out_dir, "T3_Official_Results.csv")
     
-    with open(csv_path, 'w', newline='') as f:
+    # Header matching official format
+    header_rows = [
+        ["Digital Boat Tracking Board – Result Sheet R3"],
+        ["Result Sheet – Time Stamp Accuracy"],
+        ["Test ID: T3"],
+        ["Requirement: R3"],
+        ["Requirement Statement: The system shall log boat usage data, including entry time, exit time, and total duration for each outing, with timestamps accurate to within one second."],
+        [f"Date: {datetime.now().strftime('%d/%m/%Y')}"],
+        ["Tester: Automated Test System"],
+        ["Observer: System Monitor"],
+        ["Environment: Controlled Test Environment"],
+        ["System Version / Config: v1.0 - Door-LR Logic"],
+        [],
+        ["Results Table"],
+        ["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"]
+    ]
+    
+    # Data rows
+    data_rows = [
+        [r["trial"], r["expected"], r["observed"], r["dashboard_log_status"], r["time"], r["pass_fail"], r["comments_defects"]]
+        for r in results
+    ]
+    
+    # Summary
+    total_trials = len(results)
+    passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
+    failed_trials = total_trials - passed_trials
+    accuracy = passed_trials / total_trials if total_trials > 0 else 0
+    issues = [r['comments_defects'] for r in results if r['comments_defects']]
+    
+    summary_rows = [
+        [],
+        ["Summary"],
+        [f"Total Trials: {total_trials}"],
+        [f"Passes: {passed_trials}"],
+        [f"Fails: {failed_trials}"],
+        [f"Accuracy (%): {accuracy:.1f}%"],
+        [],
+        ["Acceptance Criteria: ≥95% correct classifications across all crossings"],
+        [f"Result: {'Pass' if accuracy >= 0.95 else 'Fail'}"],
+        [f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"],
+        [],
+        ["Attachments: Screenshots, Logs, CSV Exports"]
+    ]
+    
+    with open(csv_path, 'w', newline='', buffering=1 << 16) as f:
         writer = csv.writer(f)
-        
-        # Header matching official format
-        writer.writerow(["Digital Boat Tracking Board – Result Sheet R3"])
-        writer.writerow(["Result Sheet – Time Stamp Accuracy"])
-        writer.writerow(["Test ID: T3"])
-        writer.writerow(["Requirement: R3"])
-        writer.writerow(["Requirement Statement: The system shall log boat usage data, including entry time, exit time, and total duration for each outing, with timestamps accurate to within one second."])
-        writer.writerow([f"Date: {datetime.now().strftime('%d/%m/%Y')}"])
-        writer.writerow(["Tester: Automated Test System"])
-        writer.writerow(["Observer: System Monitor"])
-        writer.writerow(["Environment: Controlled Test Environment"])
-        writer.writerow(["System Version / Config: v1.0 - Door-LR Logic"])
-        writer.writerow([])
-        writer.writerow(["Results Table"])
-        writer.writerow(["Trial No.", "Expected Result", "Observed Result", "Dashboard / Log Status", "Time (hh:mm:ss)", "Pass/Fail", "Comments / Defects"])
-        
-        # Data rows
-        for result in results:
-            writer.writerow([
-                result["trial"],
-                result["expected"],
-                result["observed"],
-                result["dashboard_log_status"],
-                result["time"],
-                result["pass_fail"],
-                result["comments_defects"]
-            ])
-        
-        # Summary
-        total_trials = len(results)
-        passed_trials = sum(1 for r in results if r["pass_fail"] == "Pass")
-        failed_trials = total_trials - passed_trials
-        accuracy = passed_trials / total_trials if total_trials > 0 else 0
-        
-        writer.writerow([])
-        writer.writerow(["Summary"])
-        writer.writerow([f"Total Trials: {total_trials}"])
-        writer.writerow([f"Passes: {passed_trials}"])
-        writer.writerow([f"Fails: {failed_trials}"])
-        writer.writerow([f"Accuracy (%): {accuracy:.1f}%"])
-        writer.writerow([])
-        writer.writerow(["Acceptance Criteria: ≥95% correct classifications across all crossings"])
-        writer.writerow([f"Result: {'Pass' if accuracy >= 0.95 else 'Fail'}"])
-        
-        issues = [r['comments_defects'] for r in results if r['comments_defects']]
-        writer.writerow([f"Issues Noted: {', '.join(issues) if issues else 'No significant issues detected'}"])
-        writer.writerow([])
-        writer.writerow(["Attachments: Screenshots, Logs, CSV Exports"])
+        writer.writerows(header_rows)
+        writer.writerows(data_rows)
+        writer.writerows(summary_rows)
     
     print(f"Official CSV saved to: {csv_path}")
 
 
-def save_detailed_log(samples: List[Dict], out_dir: str):
-    """Save detailed log data."""
+def _jsonl_line(sample: Dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(sample, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(sample) + '\n').encode('utf-8')
+
+
+def save_detailed_log(samples: np.ndarray, results: List[Dict], out_dir: str):
+    """Save detailed log data (encoded in memory, written in one call)."""
     jsonl_path = os.path.join(out_dir, "T3_Detailed_Log.jsonl")
-    with open(jsonl_path, 'w') as f:
-        for sample in samples:
-            f.write(json.dumps(sample) + '\n')
+    by_trial = {r["trial"]: r for r in results}
+    rows = zip(
+        np.datetime_as_string(samples["timestamp"]).tolist(),
+        samples["trial"].tolist(),
+        samples["sample_idx"].tolist(),
+        PHASES[samples["phase"]].tolist(),
+        samples["timestamp_error_seconds"].tolist(),
+        samples["rssi"].tolist(),
+        SCANNER_IDS[samples["scanner_id"]].tolist(),
+        BOAT_STATUSES[samples["on_water"].view(np.int8)].tolist()
+    )
+    buf = bytearray()
+    for ts, trial, idx, phase, err, rssi, scanner, status in rows:
+        result = by_trial[trial]
+        buf += _jsonl_line({
+            "timestamp": ts,
+            "trial": trial,
+            "expected": result["expected"],
+            "description": result["description"],
+            "test_type": result["test_type"],
+            "sample_idx": idx,
+            "phase": phase,
+            "timestamp_error_seconds": err,
+            "expected_duration_minutes": result["expected_duration_minutes"],
+            "rssi": rssi,
+            "scanner_id": scanner,
+            "boat_status": status
+        })
+    
+    # One write through a 1 MiB buffer instead of a write per line
+    with open(jsonl_path, 'wb', buffering=1 << 20) as f:
+        f.write(buf)
     print(f"Detailed log saved to: {jsonl_path}")
 
 
@@ -697,8 +779,12 @@ def main():
     parser.add_argument("--boat-id", default="RC-001", help="Boat ID to test")
     parser.add_argument("--trials", type=int, default=20, help="Number of trials (default: 20)")
     parser.add_argument("--output-dir", default="results/T3", help="Output directory")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed for reproducible runs (default: random)")
+    parser.add_argument("--dpi", type=int, default=150, help="Plot resolution (default: 150; use 300 for print)")
+    parser.add_argument("--no-plot", action="store_true", help="Only write the CSV and JSONL outputs (skips matplotlib)")
     
     args = parser.parse_args()
+    seed = args.seed if args.seed is not None else int.from_bytes(os.urandom(4), 'big')
     
     # Create output directory
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -708,27 +794,56 @@ def main():
     print(f"Official T3 Demo for boat {args.boat_id}")
     print(f"Generating {args.trials} trials with realistic timestamp accuracy scenarios...")
     print(f"Output directory: {out_dir}")
+    print(f"Seed: {seed}")
     
     # Generate scenarios
     scenarios = generate_realistic_scenarios()
     
-    # Generate trial data
-    results = []
-    all_samples = []
+    # Generate trial data in fixed-size blocks, each seeded from its own child of the run's seed
+    trial_scenarios = [scenarios[(trial_num - 1) % len(scenarios)] for trial_num in range(1, args.trials + 1)]
+    block_starts = range(0, args.trials, TRIAL_BLOCK)
+    block_seeds = np.random.SeedSequence(seed).spawn(len(block_starts))
+    block_args = ([trial_scenarios[start:start + TRIAL_BLOCK] for start in block_starts],
+                  [start + 1 for start in block_starts],
+                  [args.boat_id] * len(block_starts),
+                  block_seeds)
+    if len(block_starts) > 1:
+        # Only runs long enough to amortise the worker start-up fan out across cores
+        with ProcessPoolExecutor(max_workers=min(len(block_starts), os.cpu_count() or 1)) as pool:
+            blocks = list(pool.map(generate_trial_block, *block_args))
+    else:
+        blocks = list(map(generate_trial_block, *block_args))
     
-    for trial_num in range(1, args.trials + 1):
-        scenario = scenarios[(trial_num - 1) % len(scenarios)]
-        trial_result, samples = generate_trial_data(scenario, trial_num, args.boat_id)
-        results.append(trial_result)
-        all_samples.extend(samples)
-        
-        print(f"Trial {trial_num}: {scenario['description']} - {trial_result['pass_fail']} (Exit: {trial_result['exit_error_seconds']:.2f}s, Entry: {trial_result['entry_error_seconds']:.2f}s)")
+    results = [trial_result for block_results, _ in blocks for trial_result in block_results]
+    if blocks:
+        all_samples = np.concatenate([block_samples for _, block_samples in blocks])
+    else:
+        all_samples = np.empty(0, dtype=SAMPLE_DTYPE)
+    
+    for trial_result in results:
+        print(f"Trial {trial_result['trial']}: {trial_result['description']} - {trial_result['pass_fail']} (Exit: {trial_result['exit_error_seconds']:.2f}s, Entry: {trial_result['entry_error_seconds']:.2f}s)")
     
-    # Save results
-    save_official_csv(results, out_dir)
-    save_detailed_log(all_samples, out_dir)
-    create_professional_plot(all_samples, args.boat_id, out_dir, results)
-    create_split_plots(all_samples, args.boat_id, out_dir, results)
+    if args.no_plot:
+        # Save results
+        save_official_csv(results, out_dir)
+        save_detailed_log(all_samples, results, out_dir)
+    else:
+        trial_data, exit_errors, entry_errors = build_trial_data(all_samples, results)
+        
+        # Render the two plot sets in worker processes (pyplot is not thread-safe) while this one writes the CSV/JSONL
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            plot_jobs = [
+                pool.submit(create_professional_plot, trial_data, exit_errors, entry_errors, args.boat_id, out_dir,
+                            results, all_samples.size, args.dpi),
+                pool.submit(create_split_plots, trial_data, args.boat_id, out_dir, results, args.dpi)
+            ]
+            
+            # Save results
+            save_official_csv(results, out_dir)
+            save_detailed_log(all_samples, results, out_dir)
+            
+            for job in plot_jobs:
+                job.result()
     
     # Print summary
     total_trials = len(results)
@@ -736,9 +851,12 @@ def main():
     failed_trials = total_trials - passed_trials
     accuracy = passed_trials / total_trials if total_trials > 0 else 0
     
-    avg_exit_error = np.mean([r["exit_error_seconds"] for r in results])
-    avg_entry_error = np.mean([r["entry_error_seconds"] for r in results])
-    sla_compliant = sum(1 for r in results if max(r["exit_error_seconds"], r["entry_error_seconds"]) <= 1.0)
+    exits = np.fromiter((r["exit_error_seconds"] for r in results), dtype=np.float64, count=total_trials)
+    entries = np.fromiter((r["entry_error_seconds"] for r in results), dtype=np.float64, count=total_trials)
+    avg_exit_error = exits.mean() if total_trials > 0 else 0
+    avg_entry_error = entries.mean() if total_trials > 0 else 0
+    sla_compliant = int((np.maximum(exits, entries) <= 1.0).sum())
+    sla_rate = sla_compliant / total_trials if total_trials > 0 else 0
     
     print(f"\n{'='*60}")
     print(f"OFFICIAL T3 TEST SUMMARY")
@@ -749,7 +867,7 @@ def main():
     print(f"Accuracy: {accuracy:.1%}")
     print(f"Average exit error: {avg_exit_error:.3f}s")
     print(f"Average entry error: {avg_entry_error:.3f}s")
-    print(f"SLA compliance: {sla_compliant}/{total_trials} ({sla_compliant/total_trials*100:.1f}%)")
+    print(f"SLA compliance: {sla_compliant}/{total_trials} ({sla_rate:.1%})")
     print(f"Acceptance Criteria: ≥95%")
     print(f"Result: {'PASS' if accuracy >= 0.95 else 'FAIL'}")
     print(f"Results saved to: {out_dir}")
@@ -32,7 +32,6 @@ import json
 import os
 import sys
 import time
-from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
@@ -42,9 +41,15 @@ except Exception as e:  # pragma: no cover
     print("ERROR: requests is required. Try: pip install requests", file=sys.stderr)
     raise
 
+try:
+    import orjson
+except ImportError:  # optional: the presence log falls back to the stdlib encoder
+    orjson = None
+
 
-def iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def iso_at(wall_ref: float, perf_ref: float, perf_now: float) -> str:
+    """UTC ISO timestamp of a perf_counter reading, anchored to one wall-clock reading per trial."""
+    return datetime.fromtimestamp(wall_ref + (perf_now - perf_ref), tz=timezone.utc).isoformat()
 
 
 def ensure_out_dir(base_dir: str) -> str:
@@ -54,8 +59,23 @@ def ensure_out_dir(base_dir: str) -> str:
     return out_dir
 
 
-def presence_snapshot(server_url: str, boat_id: str) -> Dict[str, Any]:
-    r = requests.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
+def make_session() -> requests.Session:
+    """Session holding one keep-alive connection, reused by every presence poll."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _jsonl_line(rec: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec) + "\n").encode("utf-8")
+
+
+def presence_snapshot(session: requests.Session, server_url: str, boat_id: str) -> Dict[str, Any]:
+    r = session.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
     r.raise_for_status()
     return r.json()
 
@@ -67,40 +87,47 @@ def observed_label(in_harbor: bool) -> str:
 def majority_vote(samples: List[bool]) -> bool:
     if not samples:
         return False
-    counts = Counter(samples)
-    return counts[True] >= counts[False]
+    # Ties count as In Shed
+    return sum(samples) * 2 >= len(samples)
 
 
-def poll_presence_series(server_url: str, boat_id: str, sample_seconds: float, sample_rate_hz: float,
-                         jsonl_path: str, trial_no: int) -> Tuple[List[float], List[bool]]:
+def poll_presence_series(session: requests.Session, server_url: str, boat_id: str, sample_seconds: float,
+                         sample_rate_hz: float, jsonl_path: str, trial_no: int) -> Tuple[List[float], List[bool]]:
     interval = 1.0 / max(sample_rate_hz, 0.1)
-    end_time = time.time() + max(sample_seconds, 0.1)
+    # Sample window timed on the monotonic clock; the logged "ts" is derived from it, so
+    # the wall clock is read once per trial and the timestamps never step backwards
+    wall_ref, perf_ref = time.time(), time.perf_counter()
+    end_time = perf_ref + max(sample_seconds, 0.1)
     ts_list: List[float] = []
     inh_list: List[bool] = []
 
-    with open(jsonl_path, "a", encoding="utf-8") as f:
-        while True:
-            now = time.time()
-            if now > end_time:
-                break
-            try:
-                data = presence_snapshot(server_url, boat_id)
-                inh = bool(data.get("in_harbor", False))
-                rec = {
-                    "ts": iso_now(),
-                    "trial": trial_no,
-                    "in_harbor": inh,
-                    "status": data.get("status"),
-                    "last_seen": data.get("last_seen"),
-                    "last_rssi": data.get("last_rssi"),
-                }
-                f.write(json.dumps(rec) + "\n")
-                ts_list.append(now)
-                inh_list.append(inh)
-            except Exception as e:  # pragma: no cover
-                rec = {"ts": iso_now(), "trial": trial_no, "error": str(e)}
-                f.write(json.dumps(rec) + "\n")
-            time.sleep(interval)
+    lines: List[bytes] = []
+    while True:
+        now = time.perf_counter()
+        if now > end_time:
+            break
+        try:
+            data = presence_snapshot(session, server_url, boat_id)
+            inh = bool(data.get("in_harbor", False))
+            rec = {
+                "ts": iso_at(wall_ref, perf_ref, now),
+                "trial": trial_no,
+                "in_harbor": inh,
+                "status": data.get("status"),
+                "last_seen": data.get("last_seen"),
+                "last_rssi": data.get("last_rssi"),
+            }
+            lines.append(_jsonl_line(rec))
+            ts_list.append(now)
+            inh_list.append(inh)
+        except Exception as e:  # pragma: no cover
+            rec = {"ts": iso_at(wall_ref, perf_ref, time.perf_counter()), "trial": trial_no, "error": str(e)}
+            lines.append(_jsonl_line(rec))
+        time.sleep(interval)
+
+    # The trial's samples go out in one write once polling stops, keeping file I/O out of the sample loop
+    with open(jsonl_path, "ab", buffering=1 << 16) as f:
+        f.write(b"".join(lines))
 
     return ts_list, inh_list
 
@@ -119,41 +146,43 @@ def write_csv_header(csv_path: str) -> None:
         ])
 
 
-def append_csv_row(csv_path: str, row: List[str]) -> None:
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(row)
+def append_csv_row(csv_file, writer, row: List[str]) -> None:
+    writer.writerow(row)
+    csv_file.flush()  # finished trials stay on disk if the run is aborted
 
 
 def plot_status_over_time(jsonl_path: str, png_path: str) -> None:
     try:
         import matplotlib.pyplot as plt
+        import numpy as np
     except Exception:  # pragma: no cover
         print("Skipping plots (matplotlib not installed)")
         return
 
-    times: List[float] = []
-    vals: List[int] = []
-    t0: float = None  # type: ignore
-
-    with open(jsonl_path, "r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            if "in_harbor" not in obj:
-                continue
-            # Use file time offset for simple x-axis
-            if t0 is None:
-                t0 = time.time()
-            times.append(time.time() - t0)
-            vals.append(1 if obj.get("in_harbor") else 0)
-
-    if not times:
+    loads = orjson.loads if orjson is not None else json.loads
+
+    # Whole log in one read; the substring test skips error records without parsing them
+    with open(jsonl_path, "rb") as f:
+        raw = f.read()
+    samples: List[Dict[str, Any]] = []
+    for line in raw.split(b"\n"):
+        if b'"in_harbor"' not in line:
+            continue
+        try:
+            samples.append(loads(line))
+        except ValueError:
+            continue
+
+    if not samples:
         print("No data to plot")
         return
 
+    vals = np.fromiter((1 if obj["in_harbor"] else 0 for obj in samples), dtype=np.int8, count=len(samples))
+    # Time axis from each sample's logged UTC timestamp, relative to the first sample
+    stamps = np.fromiter((datetime.fromisoformat(obj["ts"]).timestamp() for obj in samples),
+                         dtype=np.float64, count=len(samples))
+    times = stamps - stamps[0]
+
     plt.figure(figsize=(8, 3))
     plt.step(times, vals, where="post")
     plt.yticks([0, 1], ["On Water", "In Shed"]) 
@@ -178,6 +207,7 @@ def run_interactive(args: argparse.Namespace) -> None:
 
     total = 0
     passes = 0
+    session = make_session()
 
     print("\nInstructions:")
     print("- Move the real beacon to create the intended location state.")
@@ -185,30 +215,33 @@ def run_interactive(args: argparse.Namespace) -> None:
     print(f"- The script will sample for {args.sample_seconds:.1f}s @ {args.sample_rate_hz:.1f} Hz and majority-vote the observed state.")
     print("- The result is logged to CSV and raw samples to JSONL; a plot is generated at the end.\n")
 
-    for trial in range(1, args.trials + 1):
-        exp = input(f"Trial {trial} expected (In Shed/On Water): ").strip()
-        exp_norm = exp.lower().replace(" ", "")
-        if exp_norm not in ("inshed", "onwater"):
-            print("Please type exactly 'In Shed' or 'On Water'.")
+    # Rows go through one handle kept open for the whole run
+    with open(csv_path, "a", newline="", encoding="utf-8") as csv_file:
+        csv_writer = csv.writer(csv_file)
+        for trial in range(1, args.trials + 1):
             exp = input(f"Trial {trial} expected (In Shed/On Water): ").strip()
             exp_norm = exp.lower().replace(" ", "")
-
-        print("Sampling...")
-        ts_list, inh_list = poll_presence_series(
-            args.server_url, args.boat_id, args.sample_seconds, args.sample_rate_hz, jsonl_path, trial
-        )
-        inh = majority_vote(inh_list)
-        obs = observed_label(inh)
-
-        total += 1
-        passfail = "Pass" if ((exp_norm == "inshed" and inh) or (exp_norm == "onwater" and not inh)) else "Fail"
-        if passfail == "Pass":
-            passes += 1
-
-        when = datetime.now().strftime("%H:%M:%S")
-        dash = f"presence endpoint: {'entered' if inh else 'exited'}"
-        append_csv_row(csv_path, [str(trial), exp, obs, dash, when, passfail, ""])
-        print(f"Trial {trial}: expected={exp} observed={obs} => {passfail}")
+            if exp_norm not in ("inshed", "onwater"):
+                print("Please type exactly 'In Shed' or 'On Water'.")
+                exp = input(f"Trial {trial} expected (In Shed/On Water): ").strip()
+                exp_norm = exp.lower().replace(" ", "")
+
+            print("Sampling...")
+            ts_list, inh_list = poll_presence_series(
+                session, args.server_url, args.boat_id, args.sample_seconds, args.sample_rate_hz, jsonl_path, trial
+            )
+            inh = majority_vote(inh_list)
+            obs = observed_label(inh)
+
+            total += 1
+            passfail = "Pass" if ((exp_norm == "inshed" and inh) or (exp_norm == "onwater" and not inh)) else "Fail"
+            if passfail == "Pass":
+                passes += 1
+
+            when = datetime.now().strftime("%H:%M:%S")
+            dash = f"presence endpoint: {'entered' if inh else 'exited'}"
+            append_csv_row(csv_file, csv_writer, [str(trial), exp, obs, dash, when, passfail, ""])
+            print(f"Trial {trial}: expected={exp} observed={obs} => {passfail}")
 
     # Summary
     accuracy = (passes * 100.0 / total) if total else 0.0
@@ -33,7 +33,6 @@ import json
 import os
 import sys
 import time
-from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
@@ -43,12 +42,18 @@ except Exception as e:  # pragma: no cover
     print("ERROR: requests is required. Try: pip install requests", file=sys.stderr)
     raise
 
+try:
+    import orjson
+except ImportError:  # optional: the presence log falls back to the stdlib encoder
+    orjson = None
+
 
 LATENCY_SLA = 5.0  # seconds
 
 
-def iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+def iso_at(wall_ref: float, perf_ref: float, perf_now: float) -> str:
+    """UTC ISO timestamp of a perf_counter reading, anchored to one wall-clock reading per trial."""
+    return datetime.fromtimestamp(wall_ref + (perf_now - perf_ref), tz=timezone.utc).isoformat()
 
 
 def ensure_out_dir(base_dir: str) -> str:
@@ -58,8 +63,23 @@ def ensure_out_dir(base_dir: str) -> str:
     return out_dir
 
 
-def presence_snapshot(server_url: str, boat_id: str) -> Dict[str, Any]:
-    r = requests.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
+def make_session() -> requests.Session:
+    """Session holding one keep-alive connection, reused by every presence poll."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _jsonl_line(rec: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(rec) + "\n").encode("utf-8")
+
+
+def presence_snapshot(session: requests.Session, server_url: str, boat_id: str) -> Dict[str, Any]:
+    r = session.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
     r.raise_for_status()
     return r.json()
 
@@ -83,10 +103,9 @@ def write_csv_header(csv_path: str) -> None:
         ])
 
 
-def append_csv_row(csv_path: str, row: List[str]) -> None:
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(row)
+def append_csv_row(csv_file, writer, row: List[str]) -> None:
+    writer.writerow(row)
+    csv_file.flush()  # finished trials stay on disk if the run is aborted
 
 
 def plot_latency_hist(latencies: List[float], png_path: str) -> None:
@@ -98,20 +117,20 @@ def plot_latency_hist(latencies: List[float], png_path: str) -> None:
         return
     if not latencies:
         return
+    lats = np.asarray(latencies, dtype=np.float64)
+    compliant_mask = lats <= LATENCY_SLA
     
     # Create comprehensive latency analysis plot
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 10))
     
     # Plot 1: Latency histogram with SLA line
     bins = min(15, max(5, len(latencies)//2))
-    n, bins, patches = ax1.hist(latencies, bins=bins, color="#4c78a8", edgecolor="#333", alpha=0.7)
+    counts, edges = np.histogram(lats, bins=bins)
     
-    # Color bars based on SLA compliance
-    for i, patch in enumerate(patches):
-        if bins[i] <= LATENCY_SLA:
-            patch.set_facecolor('#2ca02c')  # Green for compliant
-        else:
-            patch.set_facecolor('#d62728')  # Red for non-compliant
+    # Color bars based on SLA compliance (green compliant, red non-compliant)
+    bar_colors = np.where(edges[:-1] <= LATENCY_SLA, '#2ca02c', '#d62728')
+    ax1.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+            color=bar_colors, edgecolor="#333", alpha=0.7)
     
     ax1.axvline(LATENCY_SLA, color="red", linestyle="--", linewidth=2, label=f"SLA {LATENCY_SLA:.1f}s")
     ax1.set_xlabel("Latency (s)")
@@ -122,8 +141,8 @@ def plot_latency_hist(latencies: List[float], png_path: str) -> None:
     
     # Plot 2: Latency over time (trial sequence)
     trial_nums = list(range(1, len(latencies) + 1))
-    colors = ['green' if l <= LATENCY_SLA else 'red' for l in latencies]
-    ax2.scatter(trial_nums, latencies, c=colors, s=100, alpha=0.7, edgecolors='black')
+    colors = np.where(compliant_mask, 'green', 'red')
+    ax2.scatter(trial_nums, lats, c=colors, s=100, alpha=0.7, edgecolors='black')
     ax2.axhline(LATENCY_SLA, color="red", linestyle="--", linewidth=2, label=f"SLA {LATENCY_SLA:.1f}s")
     ax2.set_xlabel("Trial Number")
     ax2.set_ylabel("Latency (s)")
@@ -131,13 +150,13 @@ def plot_latency_hist(latencies: List[float], png_path: str) -> None:
     ax2.legend()
     ax2.grid(True, alpha=0.3)
     
-    # Add trial numbers as annotations
-    for i, (trial, lat) in enumerate(zip(trial_nums, latencies)):
-        ax2.annotate(f'T{trial}', (trial, lat), xytext=(0, 10), textcoords='offset points',
+    # Label only the trials that missed the SLA; compliant points need no callout
+    for i in np.flatnonzero(~compliant_mask).tolist():
+        ax2.annotate(f'T{trial_nums[i]}', (trial_nums[i], lats[i]), xytext=(0, 10), textcoords='offset points',
                     ha='center', va='bottom', fontsize=8)
     
     # Plot 3: SLA compliance pie chart
-    compliant = sum(1 for l in latencies if l <= LATENCY_SLA)
+    compliant = int(compliant_mask.sum())
     non_compliant = len(latencies) - compliant
     labels = ['Compliant', 'Non-Compliant']
     sizes = [compliant, non_compliant]
@@ -152,16 +171,16 @@ def plot_latency_hist(latencies: List[float], png_path: str) -> None:
     if latencies:
         stats_text = f"""Latency Statistics:
         
-Mean: {np.mean(latencies):.2f}s
-Median: {np.median(latencies):.2f}s
-Min: {np.min(latencies):.2f}s
-Max: {np.max(latencies):.2f}s
-Std Dev: {np.std(latencies):.2f}s
+Mean: {lats.mean():.2f}s
+Median: {np.median(lats):.2f}s
+Min: {lats.min():.2f}s
+Max: {lats.max():.2f}s
+Std Dev: {lats.std():.2f}s
 
 SLA Compliance:
 {compliant}/{len(latencies)} trials ({compliant/len(latencies)*100:.1f}%)
 
-95th Percentile: {np.percentile(latencies, 95):.2f}s"""
+95th Percentile: {np.percentile(lats, 95):.2f}s"""
         
         ax4.text(0.1, 0.9, stats_text, transform=ax4.transAxes, fontsize=10,
                 verticalalignment='top', fontfamily='monospace',
@@ -176,62 +195,78 @@ SLA Compliance:
     plt.close()
 
 
-def plot_timeline(times: List[float], vals: List[int], png_path: str) -> None:
+def make_timeline_axes():
+    """One Axes reused for every per-trial timeline; None when matplotlib is missing."""
     try:
         import matplotlib.pyplot as plt
     except Exception:  # pragma: no cover
-        return
-    if not times:
-        return
-    plt.figure(figsize=(8, 2.6))
-    plt.step(times, vals, where="post")
-    plt.yticks([0, 1], ["On Water", "In Shed"]) 
-    plt.xlabel("Time (s, relative to t0)")
-    plt.ylabel("Observed")
-    plt.title("Observed Location Over Time (trial)")
-    plt.grid(True, axis="y", alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(png_path, dpi=140)
-    plt.close()
+        return None
+    _fig, ax = plt.subplots(figsize=(8, 2.6))
+    return ax
 
 
-def poll_until_flip(server_url: str, boat_id: str, baseline_in_harbor: bool,
+def plot_timeline(ax, times: List[float], vals: List[int], png_path: str) -> None:
+    if ax is None or not times:
+        return
+    ax.clear()
+    ax.step(times, vals, where="post")
+    ax.set_yticks([0, 1])
+    ax.set_yticklabels(["On Water", "In Shed"])
+    ax.set_xlabel("Time (s, relative to t0)")
+    ax.set_ylabel("Observed")
+    ax.set_title("Observed Location Over Time (trial)")
+    ax.grid(True, axis="y", alpha=0.3)
+    ax.figure.tight_layout()
+    ax.figure.savefig(png_path, dpi=140)
+
+
+def poll_until_flip(session: requests.Session, server_url: str, boat_id: str, baseline_in_harbor: bool,
                     jsonl_path: str, trial_no: int, sample_rate_hz: float,
                     max_wait_seconds: float) -> Tuple[float, List[float], List[int]]:
     interval = 1.0 / max(sample_rate_hz, 0.1)
-    t0 = time.time()
+    # All latency math runs on the monotonic perf_counter, so NTP steps or suspend cannot
+    # skew a measurement; the human-readable "ts" is derived from it off one wall-clock read
+    wall_ref, t0 = time.time(), time.perf_counter()
     deadline = t0 + max(max_wait_seconds, 0.1)
+    next_tick = t0
     flipped_at: float = None  # type: ignore
     times: List[float] = []
     vals: List[int] = []
 
-    with open(jsonl_path, "a", encoding="utf-8") as f:
-        while True:
-            now = time.time()
-            if now > deadline:
+    lines: List[bytes] = []
+    while True:
+        if time.perf_counter() > deadline:
+            break
+        try:
+            data = presence_snapshot(session, server_url, boat_id)
+            now = time.perf_counter()  # response arrival: the earliest moment the new state was visible
+            inh = bool(data.get("in_harbor", False))
+            rec = {
+                "ts": iso_at(wall_ref, t0, now),
+                "trial": trial_no,
+                "since_t0_s": now - t0,
+                "in_harbor": inh,
+                "status": data.get("status"),
+                "last_seen": data.get("last_seen"),
+                "last_rssi": data.get("last_rssi"),
+            }
+            lines.append(_jsonl_line(rec))
+            times.append(now - t0)
+            vals.append(1 if inh else 0)
+            if flipped_at is None and inh != baseline_in_harbor:
+                flipped_at = now
                 break
-            try:
-                data = presence_snapshot(server_url, boat_id)
-                inh = bool(data.get("in_harbor", False))
-                rec = {
-                    "ts": iso_now(),
-                    "trial": trial_no,
-                    "since_t0_s": now - t0,
-                    "in_harbor": inh,
-                    "status": data.get("status"),
-                    "last_seen": data.get("last_seen"),
-                    "last_rssi": data.get("last_rssi"),
-                }
-                f.write(json.dumps(rec) + "\n")
-                times.append(now - t0)
-                vals.append(1 if inh else 0)
-                if flipped_at is None and inh != baseline_in_harbor:
-                    flipped_at = now
-                    break
-            except Exception as e:  # pragma: no cover
-                rec = {"ts": iso_now(), "trial": trial_no, "error": str(e)}
-                f.write(json.dumps(rec) + "\n")
-            time.sleep(interval)
+        except Exception as e:  # pragma: no cover
+            rec = {"ts": iso_at(wall_ref, t0, time.perf_counter()), "trial": trial_no, "error": str(e)}
+            lines.append(_jsonl_line(rec))
+        # Polls run on a fixed tick clock, so the request round trip comes out of the
+        # wait instead of being added to it; a slow response just skips the missed ticks
+        next_tick = max(next_tick + interval, time.perf_counter())
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+    # The trial's samples go out in one write once polling stops, keeping file I/O out of the sample loop
+    with open(jsonl_path, "ab", buffering=1 << 16) as f:
+        f.write(b"".join(lines))
 
     if flipped_at is None:
         return float("inf"), times, vals
@@ -251,6 +286,8 @@ def run_interactive(args: argparse.Namespace) -> None:
     latencies: List[float] = []
     total = 0
     passes = 0
+    session = make_session()
+    timeline_ax = make_timeline_axes()
 
     print("\nInstructions:")
     print("- For each trial, position the beacon ready to change state (e.g. at gate).")
@@ -258,51 +295,58 @@ def run_interactive(args: argparse.Namespace) -> None:
     print("- When you START the movement, press Enter to mark t0. The script will poll the API and measure latency to the first state flip.")
     print(f"- PASS if latency <= {LATENCY_SLA:.2f}s.\n")
 
-    for trial in range(1, args.trials + 1):
-        # Read baseline
-        try:
-            base = presence_snapshot(args.server_url, args.boat_id)
-        except Exception as e:
-            print(f"Failed to query presence: {e}")
-            return
-        baseline_inh = bool(base.get("in_harbor", False))
-        baseline_label = observed_label(baseline_inh)
-        print(f"Baseline: {baseline_label} (status={base.get('status')})")
-
-        exp = input(f"Trial {trial} expected after change (In Shed/On Water): ").strip()
-        exp_norm = exp.lower().replace(" ", "")
-        if exp_norm not in ("inshed", "onwater"):
-            print("Please type exactly 'In Shed' or 'On Water'.")
+    # Rows go through one handle kept open for the whole run
+    with open(csv_path, "a", newline="", encoding="utf-8") as csv_file:
+        csv_writer = csv.writer(csv_file)
+        for trial in range(1, args.trials + 1):
+            # Read baseline
+            try:
+                base = presence_snapshot(session, args.server_url, args.boat_id)
+            except Exception as e:
+                print(f"Failed to query presence: {e}")
+                return
+            baseline_inh = bool(base.get("in_harbor", False))
+            baseline_label = observed_label(baseline_inh)
+            print(f"Baseline: {baseline_label} (status={base.get('status')})")
+
             exp = input(f"Trial {trial} expected after change (In Shed/On Water): ").strip()
             exp_norm = exp.lower().replace(" ", "")
+            if exp_norm not in ("inshed", "onwater"):
+                print("Please type exactly 'In Shed' or 'On Water'.")
+                exp = input(f"Trial {trial} expected after change (In Shed/On Water): ").strip()
+                exp_norm = exp.lower().replace(" ", "")
+
+            input("Press Enter AT THE MOMENT you START the movement (t0)...")
+
+            latency, times, vals = poll_until_flip(
+                session, args.server_url, args.boat_id, baseline_inh, jsonl_path, trial, args.sample_rate_hz, args.max_wait_seconds
+            )
+            total += 1
+            if latency == float("inf"):
+                obs_label = observed_label(baseline_inh)  # no flip observed
+                passfail = "Fail"
+                latency_str = "timeout"
+            else:
+                obs_label = observed_label(not baseline_inh)
+                passfail = "Pass" if latency <= LATENCY_SLA else "Fail"
+                latency_str = f"{latency:.2f}"
+                latencies.append(latency)
+
+            when = datetime.now().strftime("%H:%M:%S")
+            dash = f"presence endpoint: {('entered' if (not baseline_inh) else 'exited')} (flip)"
+            append_csv_row(csv_file, csv_writer, [str(trial), exp, obs_label, latency_str, dash, when, passfail, ""])
+            print(f"Trial {trial}: expected={exp} observed={obs_label} latency={latency_str}s => {passfail}")
+
+            # Timeline per trial
+            try:
+                tl_png = os.path.join(out_dir, f"timeline_trial_{trial}.png")
+                plot_timeline(timeline_ax, times, vals, tl_png)
+            except Exception:
+                pass
 
-        input("Press Enter AT THE MOMENT you START the movement (t0)...")
-
-        latency, times, vals = poll_until_flip(
-            args.server_url, args.boat_id, baseline_inh, jsonl_path, trial, args.sample_rate_hz, args.max_wait_seconds
-        )
-        total += 1
-        if latency == float("inf"):
-            obs_label = observed_label(baseline_inh)  # no flip observed
-            passfail = "Fail"
-            latency_str = "timeout"
-        else:
-            obs_label = observed_label(not baseline_inh)
-            passfail = "Pass" if latency <= LATENCY_SLA else "Fail"
-            latency_str = f"{latency:.2f}"
-            latencies.append(latency)
-
-        when = datetime.now().strftime("%H:%M:%S")
-        dash = f"presence endpoint: {('entered' if (not baseline_inh) else 'exited')} (flip)"
-        append_csv_row(csv_path, [str(trial), exp, obs_label, latency_str, dash, when, passfail, ""])
-        print(f"Trial {trial}: expected={exp} observed={obs_label} latency={latency_str}s => {passfail}")
-
-        # Timeline per trial
-        try:
-            tl_png = os.path.join(out_dir, f"timeline_trial_{trial}.png")
-            plot_timeline(times, vals, tl_png)
-        except Exception:
-            pass
+    if timeline_ax is not None:
+        import matplotlib.pyplot as plt
+        plt.close(timeline_ax.figure)
 
     # Summary
     num_pass = sum(1 for _l in latencies if _l <= LATENCY_SLA)
@@ -62,8 +62,17 @@ def ensure_out_dir(base_dir: str) -> str:
     return out_dir
 
 
-def presence_snapshot(server_url: str, boat_id: str) -> Dict[str, Any]:
-    r = requests.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
+def make_session() -> requests.Session:
+    """Session holding one keep-alive connection, reused by every presence poll."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def presence_snapshot(session: requests.Session, server_url: str, boat_id: str) -> Dict[str, Any]:
+    r = session.get(f"{server_url}/api/v1/presence/{boat_id}", timeout=3)
     r.raise_for_status()
     return r.json()
 
@@ -72,8 +81,8 @@ def observed_label(in_harbor: bool) -> str:
     return "In Shed" if in_harbor else "On Water"
 
 
-def wait_for_flip(server_url: str, boat_id: str, baseline: bool, sample_rate_hz: float,
-                  max_wait_seconds: float, logf) -> Tuple[float, List[float], List[int]]:
+def wait_for_flip(session: requests.Session, server_url: str, boat_id: str, baseline: bool,
+                  sample_rate_hz: float, max_wait_seconds: float, logf) -> Tuple[float, List[float], List[int]]:
     interval = 1.0 / max(sample_rate_hz, 0.1)
     t0 = time.time()
     deadline = t0 + max(max_wait_seconds, 0.1)
@@ -85,7 +94,7 @@ def wait_for_flip(server_url: str, boat_id: str, baseline: bool, sample_rate_hz:
         if now > deadline:
             return float("inf"), times, vals
         try:
-            data = presence_snapshot(server_url, boat_id)
+            data = presence_snapshot(session, server_url, boat_id)
             inh = bool(data.get("in_harbor", False))
             rec = {
                 "ts": iso_now(),
@@ -379,10 +388,9 @@ def write_csv_header(csv_path: str) -> None:
         ])
 
 
-def append_csv(csv_path: str, row: List[str]) -> None:
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow(row)
+def append_csv(csv_file, writer, row: List[str]) -> None:
+    writer.writerow(row)
+    csv_file.flush()  # finished trials stay on disk if the run is aborted
 
 
 def run_interactive(args: argparse.Namespace) -> None:
@@ -398,6 +406,7 @@ def run_interactive(args: argparse.Namespace) -> None:
     abs_deltas_duration: List[float] = []
     total = 0
     passes = 0
+    session = make_session()
 
     print("\nInstructions:")
     print("- Each trial is an outing with two marks: Exit moment and Entry moment.")
@@ -406,102 +415,106 @@ def run_interactive(args: argparse.Namespace) -> None:
     print("- The script measures the difference between your mark and the first system-observed flip.")
     print(f"- PASS if both |ExitDeltaS| and |EntryDeltaS| <= {SLA_SECONDS:.2f}s. Duration delta is reported.\n")
 
-    for trial in range(1, args.trials + 1):
-        # Read baseline
-        base = presence_snapshot(args.server_url, args.boat_id)
-        baseline_inh = bool(base.get("in_harbor", False))
-        baseline_label = observed_label(baseline_inh)
-        print(f"Baseline: {baseline_label} (status={base.get('status')})")
-
-        seq = "Exit-then-Entry" if baseline_inh else "Entry-then-Exit"
-        print(f"Sequence this trial: {seq}")
-
-        # Exit phase (flip away from baseline)
-        with open(jsonl_path, "a", encoding="utf-8") as logf:
-            input("Press Enter AT THE EXIT MOMENT (leaving/arriving to cause first flip)...")
-            t_user_exit = time.time()
-            t_sys_exit, times_exit, vals_exit = wait_for_flip(
-                args.server_url, args.boat_id, baseline_inh, args.sample_rate_hz, args.max_wait_seconds, logf
-            )
-
-        if t_sys_exit == float("inf"):
-            # No flip observed; record timeout and continue
-            when = datetime.now().strftime("%H:%M:%S")
-            append_csv(csv_path, [str(trial), seq, f"{t_user_exit:.3f}", "timeout", "inf", "", "", "", "", "", "", "presence endpoint", when, "Fail", "No first flip observed"])
-            print("No first flip observed within wait window -> Fail")
+    # Rows go through one handle kept open for the whole run
+    with open(csv_path, "a", newline="", encoding="utf-8") as csv_file:
+        csv_writer = csv.writer(csv_file)
+        for trial in range(1, args.trials + 1):
+            # Read baseline
+            base = presence_snapshot(session, args.server_url, args.boat_id)
+            baseline_inh = bool(base.get("in_harbor", False))
+            baseline_label = observed_label(baseline_inh)
+            print(f"Baseline: {baseline_label} (status={base.get('status')})")
+
+            seq = "Exit-then-Entry" if baseline_inh else "Entry-then-Exit"
+            print(f"Sequence this trial: {seq}")
+
+            # Exit phase (flip away from baseline)
+            with open(jsonl_path, "a", encoding="utf-8") as logf:
+                input("Press Enter AT THE EXIT MOMENT (leaving/arriving to cause first flip)...")
+                t_user_exit = time.time()
+                t_sys_exit, times_exit, vals_exit = wait_for_flip(
+                    session, args.server_url, args.boat_id, baseline_inh, args.sample_rate_hz, args.max_wait_seconds, logf
+                )
+
+            if t_sys_exit == float("inf"):
+                # No flip observed; record timeout and continue
+                when = datetime.now().strftime("%H:%M:%S")
+                append_csv(csv_file, csv_writer, [str(trial), seq, f"{t_user_exit:.3f}", "timeout", "inf", "", "", "", "", "", "", "presence endpoint", when, "Fail", "No first flip observed"])
+                print("No first flip observed within wait window -> Fail")
+                total += 1
+                continue
+
+            exit_delta = abs(t_sys_exit - t_user_exit)
+            abs_deltas_exit.append(exit_delta)
+
+            # Entry phase (flip back to baseline)
+            with open(jsonl_path, "a", encoding="utf-8") as logf:
+                input("Press Enter AT THE ENTRY MOMENT (returning to cause second flip)...")
+                t_user_entry = time.time()
+                t_sys_entry, times_entry, vals_entry = wait_for_flip(
+                    session, args.server_url, args.boat_id, not baseline_inh, args.sample_rate_hz, args.max_wait_seconds, logf
+                )
+
+            if t_sys_entry == float("inf"):
+                when = datetime.now().strftime("%H:%M:%S")
+                append_csv(csv_file, csv_writer, [str(trial), seq, f"{t_user_exit:.3f}", f"{t_sys_exit:.3f}", f"{exit_delta:.2f}", f"{t_user_entry:.3f}", "timeout", "inf", "", "", "", "presence endpoint", when, "Fail", "No second flip observed"])
+                print("No second flip observed within wait window -> Fail")
+                total += 1
+                continue
+
+            entry_delta = abs(t_sys_entry - t_user_entry)
+            abs_deltas_entry.append(entry_delta)
+
+            user_duration = t_user_entry - t_user_exit
+            sys_duration = t_sys_entry - t_sys_exit
+            duration_delta = abs(sys_duration - user_duration)
+            abs_deltas_duration.append(duration_delta)
+
+            passfail = "Pass" if (exit_delta <= SLA_SECONDS and entry_delta <= SLA_SECONDS) else "Fail"
             total += 1
-            continue
+            if passfail == "Pass":
+                passes += 1
 
-        exit_delta = abs(t_sys_exit - t_user_exit)
-        abs_deltas_exit.append(exit_delta)
-
-        # Entry phase (flip back to baseline)
-        with open(jsonl_path, "a", encoding="utf-8") as logf:
-            input("Press Enter AT THE ENTRY MOMENT (returning to cause second flip)...")
-            t_user_entry = time.time()
-            t_sys_entry, times_entry, vals_entry = wait_for_flip(
-                args.server_url, args.boat_id, not baseline_inh, args.sample_rate_hz, args.max_wait_seconds, logf
+            when = datetime.now().strftime("%H:%M:%S")
+            append_csv(
+                csv_file,
+                csv_writer,
+                [
+                    str(trial),
+                    seq,
+                    f"{t_user_exit:.3f}",
+                    f"{t_sys_exit:.3f}",
+                    f"{exit_delta:.2f}",
+                    f"{t_user_entry:.3f}",
+                    f"{t_sys_entry:.3f}",
+                    f"{entry_delta:.2f}",
+                    f"{user_duration:.2f}",
+                    f"{sys_duration:.2f}",
+                    f"{duration_delta:.2f}",
+                    "presence endpoint",
+                    when,
+                    passfail,
+                    "",
+                ],
+            )
+            print(
+                f"Trial {trial}: ExitΔ={exit_delta:.2f}s EntryΔ={entry_delta:.2f}s DurΔ={duration_delta:.2f}s => {passfail}"
             )
 
-        if t_sys_entry == float("inf"):
-            when = datetime.now().strftime("%H:%M:%S")
-            append_csv(csv_path, [str(trial), seq, f"{t_user_exit:.3f}", f"{t_sys_exit:.3f}", f"{exit_delta:.2f}", f"{t_user_entry:.3f}", "timeout", "inf", "", "", "", "presence endpoint", when, "Fail", "No second flip observed"])
-            print("No second flip observed within wait window -> Fail")
-            total += 1
-            continue
-
-        entry_delta = abs(t_sys_entry - t_user_entry)
-        abs_deltas_entry.append(entry_delta)
-
-        user_duration = t_user_entry - t_user_exit
-        sys_duration = t_sys_entry - t_sys_exit
-        duration_delta = abs(sys_duration - user_duration)
-        abs_deltas_duration.append(duration_delta)
-
-        passfail = "Pass" if (exit_delta <= SLA_SECONDS and entry_delta <= SLA_SECONDS) else "Fail"
-        total += 1
-        if passfail == "Pass":
-            passes += 1
-
-        when = datetime.now().strftime("%H:%M:%S")
-        append_csv(
-            csv_path,
-            [
-                str(trial),
-                seq,
-                f"{t_user_exit:.3f}",
-                f"{t_sys_exit:.3f}",
-                f"{exit_delta:.2f}",
-                f"{t_user_entry:.3f}",
-                f"{t_sys_entry:.3f}",
-                f"{entry_delta:.2f}",
-                f"{user_duration:.2f}",
-                f"{sys_duration:.2f}",
-                f"{duration_delta:.2f}",
-                "presence endpoint",
-                when,
-                passfail,
-                "",
-            ],
-        )
-        print(
-            f"Trial {trial}: ExitΔ={exit_delta:.2f}s EntryΔ={entry_delta:.2f}s DurΔ={duration_delta:.2f}s => {passfail}"
-        )
-
-        # Plots per trial
-        try:
-            # For timeline, align user mark as t=0; system flip relative = t_sys - t_user
-            import math
-            rel_sys_exit = t_sys_exit - t_user_exit
-            rel_sys_entry = t_sys_entry - t_user_entry
-            # Reuse recorded series with approximate alignment: since_t0_s starts at first call in wait_for_flip
-            # We won't recompute exact per-sample alignment to user mark; guiding visualization is enough
-            timeline_exit_png = os.path.join(out_dir, f"timeline_trial_{trial}_exit.png")
-            timeline_entry_png = os.path.join(out_dir, f"timeline_trial_{trial}_entry.png")
-            plot_timeline(times_exit, vals_exit, 0.0, rel_sys_exit, timeline_exit_png, "Exit Phase")
-            plot_timeline(times_entry, vals_entry, 0.0, rel_sys_entry, timeline_entry_png, "Entry Phase")
-        except Exception:
-            pass
+            # Plots per trial
+            try:
+                # For timeline, align user mark as t=0; system flip relative = t_sys - t_user
+                import math
+                rel_sys_exit = t_sys_exit - t_user_exit
+                rel_sys_entry = t_sys_entry - t_user_entry
+                # Reuse recorded series with approximate alignment: since_t0_s starts at first call in wait_for_flip
+                # We won't recompute exact per-sample alignment to user mark; guiding visualization is enough
+                timeline_exit_png = os.path.join(out_dir, f"timeline_trial_{trial}_exit.png")
+                timeline_entry_png = os.path.join(out_dir, f"timeline_trial_{trial}_entry.png")
+                plot_timeline(times_exit, vals_exit, 0.0, rel_sys_exit, timeline_exit_png, "Exit Phase")
+                plot_timeline(times_entry, vals_entry, 0.0, rel_sys_entry, timeline_entry_png, "Entry Phase")
+            except Exception:
+                pass
 
     # Summary
     accuracy = (passes * 100.0 / total) if total else 0.0